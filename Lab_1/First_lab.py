@@ -33,32 +33,29 @@
 #             file.write(f"{data}: {elem.get(data)}\n")
 
 
-import re
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from log_parser import INSERTION_FIELDS, INSERTION_LOG, iter_rows, stream_stats
+
 # Чтение данных из файла
 def read_data(file_name):
-    data = []
-    with open(file_name, 'r') as file:
-        for line in file:
-            # Используем регулярные выражения для извлечения данных
-            match = re.match(r"(\d+)\s+Time taken: ([\d.]+)\s+seconds,\s+Entries:\s+(\d+),\s+Exchanges:\s+(\d+)"
-                             , line)
-            if match:
-                size = int(match.group(1))
-                time_taken = float(match.group(2))
-                entries = int(match.group(3))
-                exchanges = int(match.group(4))
-                data.append((size, time_taken, entries, exchanges))
-    return data
-
-data = read_data(r"C:\Users\nikit\OneDrive\Рабочий стол\Lab\datas.txt") #<------------ берем из txt файла после прогонки
-                                                                                # серии сортировок при помощи языка C
-sizes = [item[0] for item in data]
-times = [item[1] for item in data]
-entries = [item[2] for item in data]
-exchanges = [item[3] for item in data]
+    """Все строки журнала одним массивом: столбцы размер, время, обходы, обмены"""
+    # Файл читается крупными кусками, каждый кусок разбирается одним скомпилированным regex
+    chunks = list(iter_rows(file_name, INSERTION_LOG))
+    return np.concatenate(chunks) if chunks else np.empty((0, 4))
+
+data_file = r"C:\Users\nikit\OneDrive\Рабочий стол\Lab\datas.txt" #<------------ берем из txt файла после прогонки
+                                                                  # серии сортировок при помощи языка C
+data = read_data(data_file)
+sizes = data[:, 0]
+times = data[:, 1]
+entries = data[:, 2]
+exchanges = data[:, 3]
 
 # График зависимости времени от размера массива
 plt.figure(figsize=(10, 6))
@@ -77,7 +74,7 @@ plt.figure(figsize=(10, 6))
 plt.plot(sizes, times, label='Наихудшее время', color='blue', marker='o')
 
 # O(N^2) (с константой с)
-O_N2 = [c * size**2 for size, c in zip(sizes, [0.000001]*len(sizes))]  # Подбираем c
+O_N2 = 0.000001 * sizes ** 2  # Подбираем c
 plt.plot(sizes, O_N2, label='O(N^2)', color='red', linestyle='--')
 
 plt.xlabel('Размер массива')
@@ -87,18 +84,13 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-# Для среднего времени можно подсчитать среднее по каждому размеру
-# Например, можно подсчитать по каждой группе данных
-unique_sizes = sorted(set(sizes))
-avg_times = []
-min_times = []
-max_times = []
-
-for size in unique_sizes:
-    filtered_times = [t for i, t in enumerate(times) if sizes[i] == size]
-    avg_times.append(np.mean(filtered_times))
-    min_times.append(np.min(filtered_times))
-    max_times.append(np.max(filtered_times))
+# Среднее, минимум и максимум по каждому размеру считаются потоково,
+# без хранения всех строк журнала
+stats = stream_stats(data_file, INSERTION_LOG, INSERTION_FIELDS)
+unique_sizes = sorted(stats)
+avg_times = [stats[size]["time"].mean for size in unique_sizes]
+min_times = [stats[size]["time"].min for size in unique_sizes]
+max_times = [stats[size]["time"].max for size in unique_sizes]
 
 plt.figure(figsize=(10, 6))
 plt.plot(unique_sizes, avg_times, label='Среднее время', color='green')
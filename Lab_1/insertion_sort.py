@@ -0,0 +1,101 @@
+import time
+from bisect import bisect_right
+from random import uniform
+
+
+# ---------- Сортировка вставками ----------
+# Все функции сортируют диапазон nums[lo:hi] на месте и возвращают пару
+# (entries, exchanges) - те же счётчики, что пишет в datas.txt 1_second_var.cpp:
+# entries - число итераций внешнего цикла (hi - lo - 1, включая пропущенное
+# упорядоченное начало), exchanges - число сдвигов элементов.
+
+def _natural_run(nums, lo, hi):
+    """
+    Длина уже упорядоченного начала диапазона nums[lo:hi].
+    Строго убывающее начало разворачивается на месте. Возвращает (конец серии, обмены).
+    """
+    if hi - lo < 2:
+        return hi, 0
+    end = lo + 1
+    if nums[end] < nums[lo]:
+        while end + 1 < hi and nums[end + 1] < nums[end]:
+            end += 1
+        end += 1
+        nums[lo:end] = nums[lo:end][::-1]
+        return end, (end - lo) // 2
+    while end + 1 < hi and nums[end] <= nums[end + 1]:
+        end += 1
+    return end + 1, 0
+
+
+def insertion_sort(nums, lo=0, hi=None):
+    """
+    Сортировка вставками со сдвигами вместо попарных обменов.
+    Уже упорядоченное (или строго убывающее) начало диапазона пропускается,
+    для каждого следующего элемента внутренний цикл останавливается сразу,
+    если элемент уже стоит на месте.
+    """
+    if hi is None:
+        hi = len(nums)
+    start, exchanges = _natural_run(nums, lo, hi)
+    entries = max(0, start - lo - 1)  # итерации, пропущенные вместе с упорядоченным началом
+
+    for i in range(start, hi):
+        entries += 1
+        x = nums[i]
+        if nums[i - 1] <= x:
+            continue
+        j = i - 1
+        while j >= lo and nums[j] > x:
+            nums[j + 1] = nums[j]
+            j -= 1
+        exchanges += i - 1 - j
+        nums[j + 1] = x
+    return entries, exchanges
+
+
+def binary_insertion_sort(nums, lo=0, hi=None, start=None):
+    """
+    Бинарная сортировка вставками: место элемента ищется двоичным поиском
+    (O(n log n) сравнений), сдвиг выполняется одним срезом.
+    start - конец уже отсортированного начала диапазона, если он известен.
+    """
+    if hi is None:
+        hi = len(nums)
+    exchanges = 0
+    if start is None:
+        start, exchanges = _natural_run(nums, lo, hi)
+    entries = max(0, start - lo - 1)  # итерации, пропущенные вместе с упорядоченным началом
+
+    for i in range(start, hi):
+        entries += 1
+        x = nums[i]
+        if nums[i - 1] <= x:
+            continue
+        position = bisect_right(nums, x, lo, i)
+        nums[position + 1:i + 1] = nums[position:i]
+        nums[position] = x
+        exchanges += i - position
+    return entries, exchanges
+
+
+if __name__ == "__main__":
+
+    dimensions = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000]
+    lines = []
+
+    for dimension in dimensions:
+        for approach in range(20):
+            mass = [uniform(-1, 1) for _ in range(dimension)]
+
+            start_time = time.time()
+            entries, exchanges = binary_insertion_sort(mass)
+            execution_time = time.time() - start_time
+
+            # Формат datas.txt, который разбирает First_lab.read_data. Файл отдельный:
+            # datas.txt - журнал программы на C, серии не должны смешиваться
+            lines.append(f"{dimension} Time taken: {execution_time:.6f} seconds, "
+                         f"Entries: {entries}, Exchanges: {exchanges}\n")
+
+    with open("datas_py.txt", "a", encoding="utf-8") as file:
+        file.writelines(lines)
@@ -0,0 +1,166 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import quicksort_numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_8"))
+from heap import MinHeap
+
+
+# Объём памяти на всю сортировку и размер буфера чтения/записи (в байтах)
+MEMORY_BUDGET = 256 * 1024 * 1024
+IO_BUFFER = 1024 * 1024
+
+ITEM_SIZE = np.dtype(np.float64).itemsize
+# Во сколько раз пик памяти больше самих данных: quicksort_numpy на куске держит
+# маски и копии разбиений (около 3.4 размера куска), буфер слияния - список
+# float Python (32 байта на число вместо 8) плюс массив, из которого он получен
+SORT_OVERHEAD = 4
+MERGE_OVERHEAD = 6
+
+
+class _RunReader:
+    """Последовательное чтение отсортированной серии из файла блоками по buffer_items чисел"""
+
+    def __init__(self, path, buffer_items):
+        self.file = open(path, "rb")
+        self.buffer_items = buffer_items
+        self.buffer = []
+        self.position = 0
+
+    def next(self):
+        if self.position == len(self.buffer):
+            self.buffer = np.fromfile(self.file, dtype=np.float64, count=self.buffer_items).tolist()
+            self.position = 0
+            if not self.buffer:
+                return None
+        value = self.buffer[self.position]
+        self.position += 1
+        return value
+
+    def close(self):
+        self.file.close()
+
+
+def _write_runs(input_path, tmp_dir, memory_budget):
+    """
+    Фаза 1: режет вход (memmap) на куски по memory_budget / SORT_OVERHEAD байт,
+    сортирует и сбрасывает серии на диск
+    """
+    if os.path.getsize(input_path) == 0:
+        return []
+    data = np.memmap(input_path, dtype=np.float64, mode="r")
+    chunk_items = max(1, memory_budget // (SORT_OVERHEAD * ITEM_SIZE))
+    run_paths = []
+
+    for start in range(0, data.size, chunk_items):
+        chunk = np.array(data[start:start + chunk_items])
+        quicksort_numpy.quicksort_numpy(chunk)
+        path = os.path.join(tmp_dir, f"run_{len(run_paths)}.bin")
+        chunk.tofile(path)
+        run_paths.append(path)
+
+    del data
+    return run_paths
+
+
+def _merge_runs(run_paths, output_path, io_buffer):
+    """Фаза 2: k-путевое слияние серий через MinHeap (Lab_8) с буферизованным вводом-выводом"""
+    buffer_items = max(1, io_buffer // ITEM_SIZE)
+    readers = [_RunReader(path, buffer_items) for path in run_paths]
+    heap = MinHeap()
+    out = []
+
+    try:
+        for index, reader in enumerate(readers):
+            value = reader.next()
+            if value is not None:
+                heap.insert((value, index))
+
+        with open(output_path, "wb") as output:
+            while heap.size() > 0:
+                value, index = heap.remove_min()
+                out.append(value)
+                if len(out) >= buffer_items:
+                    np.array(out, dtype=np.float64).tofile(output)
+                    out.clear()
+
+                value = readers[index].next()
+                if value is not None:
+                    heap.insert((value, index))
+
+            if out:
+                np.array(out, dtype=np.float64).tofile(output)
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+def external_sort(input_path, output_path, memory_budget=MEMORY_BUDGET, io_buffer=IO_BUFFER, tmp_dir=None):
+    """
+    Внешняя сортировка файла чисел float64 (сырой двоичный формат, как у ndarray.tofile)
+    размером больше оперативной памяти. Пик памяти не превышает memory_budget:
+    кусок фазы 1 и буферы слияния (по одному на серию и выходной) берутся
+    с запасом SORT_OVERHEAD и MERGE_OVERHEAD. Возвращает число отсортированных серий.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        run_paths = _write_runs(input_path, run_dir, memory_budget)
+        if len(run_paths) == 1:
+            shutil.move(run_paths[0], output_path)
+        else:
+            io_buffer = min(io_buffer, memory_budget // (MERGE_OVERHEAD * (len(run_paths) + 1)))
+            _merge_runs(run_paths, output_path, io_buffer)
+        return len(run_paths)
+
+
+def test_memory_budget():
+    """Пик памяти (tracemalloc) при сортировке в несколько серий не превышает memory_budget"""
+    dimension = 5 * 10 ** 5
+    memory_budget = 2 * 1024 * 1024
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "input.bin")
+        output_path = os.path.join(work_dir, "output.bin")
+        np.random.default_rng(0).uniform(-1, 1, dimension).tofile(input_path)
+
+        tracemalloc.start()
+        try:
+            runs = external_sort(input_path, output_path, memory_budget=memory_budget)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = np.fromfile(output_path, dtype=np.float64)
+        assert runs > 1 and result.size == dimension and bool(np.all(result[:-1] <= result[1:]))
+        assert peak <= memory_budget, f"пик {peak} байт при бюджете {memory_budget}"
+
+
+if __name__ == "__main__":
+
+    test_memory_budget()
+
+    dimensions = [10 ** 6, 10 ** 7]
+    rng = np.random.default_rng()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "input.bin")
+        output_path = os.path.join(work_dir, "output.bin")
+
+        for dimension in dimensions:
+            rng.uniform(-1, 1, dimension).tofile(input_path)
+
+            # Бюджет памяти - примерно десятая часть данных, чтобы получилось несколько серий
+            start_time = time.time()
+            runs = external_sort(input_path, output_path, memory_budget=dimension * ITEM_SIZE // 10)
+            execution_time = time.time() - start_time
+
+            result = np.memmap(output_path, dtype=np.float64, mode="r")
+            assert result.size == dimension and bool(np.all(result[:-1] <= result[1:]))
+            del result
+
+            print(f"Размерность: {dimension} Серий: {runs} Время: {execution_time:.6f}")
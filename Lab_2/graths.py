@@ -1,30 +1,31 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+from results_store import QUICKSORT_COLUMNS, load_results
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from log_parser import QUICKSORT_FIELDS, QUICKSORT_LOG, RunningStats, stream_stats
+
 
 def read_results(file_name):
+    """
+    Статистики по размерностям: {размерность: {метрика: RunningStats}}.
+    Читает results.csv / results.npz или потоково разбирает текстовый results.txt.
+    """
+    if file_name.endswith(".txt"):
+        return stream_stats(file_name, QUICKSORT_LOG, QUICKSORT_FIELDS)
+
+    table = load_results(file_name, QUICKSORT_COLUMNS)
     data = {}
-    with open(file_name, 'r', encoding='utf-8') as file:
-        for line in file:
-            parts = line.strip().split(" ")
-            dimension = int(parts[1])
-            time = float(parts[3])
-            recursion_calls = int(parts[7])
-            depth = int(parts[10])
-            swaps = int(parts[13])
-
-            if dimension not in data:
-                data[dimension] = {
-                    "time": [],
-                    "recursion_calls": [],
-                    "depth": [],
-                    "swaps": []
-                }
-            data[dimension]["time"].append(time)
-            data[dimension]["recursion_calls"].append(recursion_calls)
-            data[dimension]["depth"].append(depth)
-            data[dimension]["swaps"].append(swaps)
-
+    for dimension in np.unique(table["dimension"]):
+        mask = table["dimension"] == dimension
+        data[int(dimension)] = {}
+        for field in QUICKSORT_FIELDS:
+            data[int(dimension)][field] = RunningStats()
+            data[int(dimension)][field].update(table[field][mask])
     return data
 
 
@@ -34,10 +35,10 @@ def build_graphs(data):
     x = np.array(dimensions)
     y_on = x * np.log2(x)
 
-    C = max(max(data[dim]["time"]) for dim in dimensions) / max(y_on)
+    C = max(data[dim]["time"].max for dim in dimensions) / max(y_on)
     y_on_scaled = C * y_on
 
-    worst_times = [max(data[dim]["time"]) for dim in dimensions]
+    worst_times = [data[dim]["time"].max for dim in dimensions]
 
     plt.figure(figsize=(10, 6))
     plt.plot(dimensions, worst_times, label='Наихудшее время', marker='o')
@@ -50,9 +51,9 @@ def build_graphs(data):
     plt.savefig("time_vs_on.png")
     plt.show()
 
-    avg_times = [np.mean(data[dim]["time"]) for dim in dimensions]
-    best_times = [min(data[dim]["time"]) for dim in dimensions]
-    worst_times = [max(data[dim]["time"]) for dim in dimensions]
+    avg_times = [data[dim]["time"].mean for dim in dimensions]
+    best_times = [data[dim]["time"].min for dim in dimensions]
+    worst_times = [data[dim]["time"].max for dim in dimensions]
 
     plt.figure(figsize=(10, 6))
     plt.plot(dimensions, avg_times, label='Среднее время', marker='o')
@@ -66,9 +67,9 @@ def build_graphs(data):
     plt.savefig("time_comparison.png")
     plt.show()
 
-    avg_depth = [np.mean(data[dim]["depth"]) for dim in dimensions]
-    best_depth = [min(data[dim]["depth"]) for dim in dimensions]
-    worst_depth = [max(data[dim]["depth"]) for dim in dimensions]
+    avg_depth = [data[dim]["depth"].mean for dim in dimensions]
+    best_depth = [data[dim]["depth"].min for dim in dimensions]
+    worst_depth = [data[dim]["depth"].max for dim in dimensions]
 
     plt.figure(figsize=(10, 6))
     plt.plot(dimensions, avg_depth, label='Средняя глубина рекурсии', marker='o')
@@ -82,9 +83,9 @@ def build_graphs(data):
     plt.savefig("recursion_depth_comparison.png")
     plt.show()
 
-    avg_swaps = [np.mean(data[dim]["swaps"]) for dim in dimensions]
-    best_swaps = [min(data[dim]["swaps"]) for dim in dimensions]
-    worst_swaps = [max(data[dim]["swaps"]) for dim in dimensions]
+    avg_swaps = [data[dim]["swaps"].mean for dim in dimensions]
+    best_swaps = [data[dim]["swaps"].min for dim in dimensions]
+    worst_swaps = [data[dim]["swaps"].max for dim in dimensions]
 
     plt.figure(figsize=(10, 6))
     plt.plot(dimensions, avg_swaps, label='Среднее число обменов', marker='o')
@@ -98,9 +99,9 @@ def build_graphs(data):
     plt.savefig("swap_operations_comparison.png")
     plt.show()
 
-    avg_calls = [np.mean(data[dim]["recursion_calls"]) for dim in dimensions]
-    best_calls = [min(data[dim]["recursion_calls"]) for dim in dimensions]
-    worst_calls = [max(data[dim]["recursion_calls"]) for dim in dimensions]
+    avg_calls = [data[dim]["recursion_calls"].mean for dim in dimensions]
+    best_calls = [data[dim]["recursion_calls"].min for dim in dimensions]
+    worst_calls = [data[dim]["recursion_calls"].max for dim in dimensions]
 
     plt.figure(figsize=(10, 6))
     plt.plot(dimensions, avg_calls, label='Среднее число вызовов', marker='o')
@@ -116,7 +117,10 @@ def build_graphs(data):
 
 
 if __name__ == "__main__":
-    results_file = "results.txt"
+    results_file = "results.csv"
+    if not os.path.exists(results_file):
+        # Таблица ещё не собрана - разбираем текстовый лог из репозитория
+        results_file = "results.txt"
     data = read_results(results_file)
 
     build_graphs(data)
@@ -0,0 +1,322 @@
+import os
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from random import uniform
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_1"))
+from insertion_sort import _natural_run, binary_insertion_sort
+from results_store import ResultsStore
+
+
+comparisons = 0
+move_operations = 0
+merge_calls = 0
+max_run_stack = 0
+
+# Минимальное число подряд "выигранных" сравнений для перехода в режим галопа
+MIN_GALLOP = 7
+
+MERGESORT_COLUMNS = [
+    ("dimension", "i8"),
+    ("time", "f8"),
+    ("comparisons", "i8"),
+    ("moves", "i8"),
+    ("merges", "i8"),
+    ("run_stack", "i8"),
+]
+
+
+def _min_run(n):
+    """Минимальная длина серии: n / minrun чуть меньше степени двойки (как в Timsort)"""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+class _MergeState:
+    """Стек серий, общий временный буфер и счётчики одного запуска сортировки"""
+
+    def __init__(self, nums):
+        self.nums = nums
+        self.runs = []
+        self.tmp = []
+        self.min_gallop = MIN_GALLOP
+        self.comparisons = 0
+        self.moves = 0
+        self.merges = 0
+        self.max_stack = 0
+
+    # ---------- Галоп ----------
+
+    def gallop(self, key, a, lo, hi, right, from_end):
+        """
+        Позиция вставки key в отсортированный a[lo:hi]: экспоненциальный поиск
+        от начала (или конца) диапазона и двоичный поиск внутри найденного окна.
+        right=True - после равных элементов, иначе - перед ними.
+        """
+        ofs = 1
+        if from_end:
+            last = hi
+            p = hi - 1
+            while p >= lo and (a[p] > key if right else a[p] >= key):
+                self.comparisons += 1
+                last = p
+                ofs <<= 1
+                p = hi - ofs
+            first = max(lo, p + 1)
+        else:
+            first = lo
+            p = lo
+            while p < hi and (a[p] <= key if right else a[p] < key):
+                self.comparisons += 1
+                first = p + 1
+                ofs <<= 1
+                p = lo + ofs - 1
+            last = min(p, hi)
+        self.comparisons += 1 + (last - first).bit_length()
+        if right:
+            return bisect_right(a, key, first, last)
+        return bisect_left(a, key, first, last)
+
+    # ---------- Слияние ----------
+
+    def _reserve(self, size):
+        if len(self.tmp) < size:
+            self.tmp.extend([None] * (size - len(self.tmp)))
+
+    def merge_lo(self, base1, len1, base2, len2):
+        """Слияние слева направо: во временный буфер копируется более короткая первая серия"""
+        a = self.nums
+        self._reserve(len1)
+        tmp = self.tmp
+        tmp[0:len1] = a[base1:base1 + len1]
+        i, j, dest = 0, base2, base1
+        end2 = base2 + len2
+        min_gallop = self.min_gallop
+
+        while i < len1 and j < end2:
+            # Поэлементный режим
+            count1 = count2 = 0
+            while i < len1 and j < end2:
+                self.comparisons += 1
+                if a[j] < tmp[i]:
+                    a[dest] = a[j]
+                    j += 1
+                    count2 += 1
+                    count1 = 0
+                else:
+                    a[dest] = tmp[i]
+                    i += 1
+                    count1 += 1
+                    count2 = 0
+                dest += 1
+                self.moves += 1
+                if count1 >= min_gallop or count2 >= min_gallop:
+                    break
+            else:
+                break
+
+            # Режим галопа: переносим целые блоки, пока они длинные
+            while i < len1 and j < end2:
+                k1 = self.gallop(a[j], tmp, i, len1, right=True, from_end=False) - i
+                if k1:
+                    a[dest:dest + k1] = tmp[i:i + k1]
+                    dest += k1
+                    i += k1
+                    self.moves += k1
+                if i >= len1:
+                    break
+                k2 = self.gallop(tmp[i], a, j, end2, right=False, from_end=False) - j
+                if k2:
+                    a[dest:dest + k2] = a[j:j + k2]
+                    dest += k2
+                    j += k2
+                    self.moves += k2
+                if j >= end2:
+                    break
+                if k1 < MIN_GALLOP and k2 < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+
+        if i < len1:
+            a[dest:dest + len1 - i] = tmp[i:len1]
+            self.moves += len1 - i
+        self.min_gallop = min_gallop
+
+    def merge_hi(self, base1, len1, base2, len2):
+        """Слияние справа налево: во временный буфер копируется более короткая вторая серия"""
+        a = self.nums
+        self._reserve(len2)
+        tmp = self.tmp
+        tmp[0:len2] = a[base2:base2 + len2]
+        i, j, dest = base1 + len1 - 1, len2 - 1, base2 + len2 - 1
+        min_gallop = self.min_gallop
+
+        while i >= base1 and j >= 0:
+            count1 = count2 = 0
+            while i >= base1 and j >= 0:
+                self.comparisons += 1
+                if tmp[j] < a[i]:
+                    a[dest] = a[i]
+                    i -= 1
+                    count1 += 1
+                    count2 = 0
+                else:
+                    a[dest] = tmp[j]
+                    j -= 1
+                    count2 += 1
+                    count1 = 0
+                dest -= 1
+                self.moves += 1
+                if count1 >= min_gallop or count2 >= min_gallop:
+                    break
+            else:
+                break
+
+            while i >= base1 and j >= 0:
+                k1 = i + 1 - self.gallop(tmp[j], a, base1, i + 1, right=True, from_end=True)
+                if k1:
+                    a[dest - k1 + 1:dest + 1] = a[i - k1 + 1:i + 1]
+                    dest -= k1
+                    i -= k1
+                    self.moves += k1
+                if i < base1:
+                    break
+                k2 = j + 1 - self.gallop(a[i], tmp, 0, j + 1, right=False, from_end=True)
+                if k2:
+                    a[dest - k2 + 1:dest + 1] = tmp[j - k2 + 1:j + 1]
+                    dest -= k2
+                    j -= k2
+                    self.moves += k2
+                if j < 0:
+                    break
+                if k1 < MIN_GALLOP and k2 < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+
+        if j >= 0:
+            a[base1:base1 + j + 1] = tmp[0:j + 1]
+            self.moves += j + 1
+        self.min_gallop = min_gallop
+
+    def merge_at(self, n):
+        """Сливает серии n и n + 1 стека"""
+        a = self.nums
+        base1, len1 = self.runs[n]
+        base2, len2 = self.runs[n + 1]
+        self.runs[n] = (base1, len1 + len2)
+        del self.runs[n + 1]
+        self.merges += 1
+
+        # Начало первой серии, не превосходящее a[base2], уже на месте
+        k = self.gallop(a[base2], a, base1, base1 + len1, right=True, from_end=False) - base1
+        base1 += k
+        len1 -= k
+        if len1 == 0:
+            return
+        # Хвост второй серии, не меньший последнего элемента первой, тоже на месте
+        len2 = self.gallop(a[base1 + len1 - 1], a, base2, base2 + len2, right=False, from_end=True) - base2
+        if len2 == 0:
+            return
+
+        if len1 <= len2:
+            self.merge_lo(base1, len1, base2, len2)
+        else:
+            self.merge_hi(base1, len1, base2, len2)
+
+    def merge_collapse(self):
+        """Поддерживает инварианты длин серий на стеке (с исправлением de Gouw et al.)"""
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                    (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                break
+            self.merge_at(n)
+
+    def merge_force_collapse(self):
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            self.merge_at(n)
+
+
+def natural_mergesort(nums):
+    """
+    Естественная сортировка слиянием в стиле Timsort, на месте.
+    Находит возрастающие и строго убывающие (разворачиваются) серии, короткие
+    серии дополняет бинарными вставками до minrun, сливает их с режимом галопа
+    через один переиспользуемый буфер. Сортировка устойчива.
+    Обновляет счётчики comparisons, move_operations, merge_calls, max_run_stack.
+    """
+    global comparisons, move_operations, merge_calls, max_run_stack
+
+    n = len(nums)
+    state = _MergeState(nums)
+    min_run = _min_run(n)
+    lo = 0
+
+    while lo < n:
+        run_end, reversed_moves = _natural_run(nums, lo, n)
+        state.comparisons += run_end - lo
+        state.moves += 2 * reversed_moves
+
+        if run_end - lo < min_run:
+            force_end = min(n, lo + min_run)
+            _, shifts = binary_insertion_sort(nums, lo, force_end, start=run_end)
+            state.comparisons += (force_end - run_end) * (force_end - lo).bit_length()
+            state.moves += shifts
+            run_end = force_end
+
+        state.runs.append((lo, run_end - lo))
+        state.max_stack = max(state.max_stack, len(state.runs))
+        state.merge_collapse()
+        lo = run_end
+
+    state.merge_force_collapse()
+
+    comparisons += state.comparisons
+    move_operations += state.moves
+    merge_calls += state.merges
+    max_run_stack = max(max_run_stack, state.max_stack)
+    return nums
+
+
+if __name__ == "__main__":
+
+    dimensions = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000]
+
+    with ResultsStore("results_mergesort.csv", MERGESORT_COLUMNS) as store:
+        for dimension in dimensions:
+            for approach in range(20):
+                nums = [uniform(-1, 1) for _ in range(dimension)]
+
+                # Сброс счетчиков
+                comparisons = 0
+                move_operations = 0
+                merge_calls = 0
+                max_run_stack = 0
+
+                start_time = time.time()
+                natural_mergesort(nums)
+                execution_time = time.time() - start_time
+
+                store.append({
+                    "dimension": dimension,
+                    "time": execution_time,
+                    "comparisons": comparisons,
+                    "moves": move_operations,
+                    "merges": merge_calls,
+                    "run_stack": max_run_stack,
+                })
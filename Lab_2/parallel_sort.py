@@ -0,0 +1,174 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import quicksort_numpy
+from quicksort_numpy import _choose_pivot, _partition3
+from results_store import QUICKSORT_COLUMNS, ResultsStore
+
+
+PARALLEL_COLUMNS = [("workers", "i8"), ("speedup", "f8")] + QUICKSORT_COLUMNS
+
+
+recursion_calls = 0
+max_recursion_depth = 0
+swap_operations = 0
+
+
+def _sort_shared_range(shm_name, size, lo, hi, depth):
+    """
+    Выполняется в процессе-работнике: подключается к общей памяти по имени
+    и сортирует диапазон arr[lo..hi] на месте. Возвращает счётчики работника.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arr = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+        quicksort_numpy.recursion_calls = 0
+        quicksort_numpy.max_recursion_depth = 0
+        quicksort_numpy.swap_operations = 0
+        quicksort_numpy.quicksort_numpy(arr[lo:hi + 1])
+        del arr
+        return (quicksort_numpy.recursion_calls,
+                depth + quicksort_numpy.max_recursion_depth,
+                quicksort_numpy.swap_operations)
+    finally:
+        shm.close()
+
+
+def parallel_quicksort(nums, workers=None, cutoff=None, executor=None):
+    """
+    Параллельная быстрая сортировка массива float64 на месте.
+    Верхние уровни разбиения выполняются в родительском процессе, пока диапазоны
+    длиннее cutoff; оставшиеся диапазоны независимо сортируются пулом процессов
+    в общей памяти (данные не сериализуются). Результат копируется обратно в nums.
+    """
+    global recursion_calls, max_recursion_depth, swap_operations
+
+    workers = workers or os.cpu_count()
+    size = nums.size
+    if cutoff is None:
+        # Несколько диапазонов на работника сглаживают неравномерность разбиения
+        cutoff = max(quicksort_numpy.VECTOR_THRESHOLD, size // (workers * 4))
+    if size <= cutoff:
+        quicksort_numpy.recursion_calls = recursion_calls
+        quicksort_numpy.max_recursion_depth = max_recursion_depth
+        quicksort_numpy.swap_operations = swap_operations
+        quicksort_numpy.quicksort_numpy(nums)
+        recursion_calls = quicksort_numpy.recursion_calls
+        max_recursion_depth = quicksort_numpy.max_recursion_depth
+        swap_operations = quicksort_numpy.swap_operations
+        return nums
+
+    shm = shared_memory.SharedMemory(create=True, size=nums.nbytes)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        arr = np.ndarray(nums.shape, dtype=np.float64, buffer=shm.buf)
+        arr[:] = nums
+
+        # NaN не сравнимы ни с чем и _partition3 их не переносит: как в quicksort_numpy,
+        # сдвигаем их в конец и сортируем только префикс arr[:n]
+        nan = np.isnan(arr)
+        n = size - int(np.count_nonzero(nan))
+        if n < size:
+            arr[:] = np.concatenate((arr[~nan], arr[nan]))
+        del nan
+
+        # Разбиение верхних уровней в родителе
+        depth_limit = 2 * int(math.log2(max(n, 1)))
+        stack = [(0, n - 1, 0)] if n > 1 else []
+        leaves = []
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo + 1 <= cutoff or depth >= depth_limit:
+                leaves.append((lo, hi, depth))
+                continue
+            recursion_calls += 1
+            max_recursion_depth = max(max_recursion_depth, depth)
+            lt, gt, swaps = _partition3(arr, lo, hi, _choose_pivot(arr, lo, hi))
+            swap_operations += swaps
+            if lo < lt - 1:
+                stack.append((lo, lt - 1, depth + 1))
+            if gt + 1 < hi:
+                stack.append((gt + 1, hi, depth + 1))
+
+        # Крупные диапазоны отправляем первыми
+        leaves.sort(key=lambda leaf: leaf[0] - leaf[1])
+        futures = [executor.submit(_sort_shared_range, shm.name, size, lo, hi, depth)
+                   for lo, hi, depth in leaves]
+        for future in futures:
+            calls, depth, swaps = future.result()
+            recursion_calls += calls
+            max_recursion_depth = max(max_recursion_depth, depth)
+            swap_operations += swaps
+
+        nums[:] = arr
+        del arr
+    finally:
+        if own_executor:
+            executor.shutdown()
+        shm.close()
+        shm.unlink()
+    return nums
+
+
+def test_nan():
+    """NaN оказываются в конце, как у np.sort, и при разбиении в родителе, и без него"""
+    nums = np.array([3, np.nan, 1, 2] * 10 ** 5)
+    expected = np.sort(nums)
+    for cutoff in (None, nums.size):
+        result = parallel_quicksort(nums.copy(), workers=2, cutoff=cutoff)
+        assert np.array_equal(result, expected, equal_nan=True), f"NaN в середине (cutoff={cutoff})"
+    all_nan = np.full(10 ** 5, np.nan)
+    assert np.isnan(parallel_quicksort(all_nan, workers=2, cutoff=1000)).all()
+
+
+if __name__ == "__main__":
+
+    test_nan()
+
+    dimensions = [128000, 10 ** 6, 10 ** 7]
+    worker_counts = sorted({1, 2, 4, os.cpu_count()})
+    rng = np.random.default_rng()
+    store = ResultsStore("results_parallel.csv", PARALLEL_COLUMNS)
+
+    for workers in worker_counts:
+        # Пул создаётся один раз, чтобы запуск процессов не попадал в замер
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for dimension in dimensions:
+                for approach in range(5):
+                    nums = rng.uniform(-1, 1, dimension)
+                    baseline_nums = nums.copy()
+
+                    start_time = time.time()
+                    quicksort_numpy.quicksort_numpy(baseline_nums)
+                    serial_time = time.time() - start_time
+
+                    # Сброс счетчиков
+                    recursion_calls = 0
+                    max_recursion_depth = 0
+                    swap_operations = 0
+
+                    start_time = time.time()
+                    parallel_quicksort(nums, workers=workers, executor=executor)
+                    parallel_time = time.time() - start_time
+
+                    print(f"N={dimension} workers={workers}: {parallel_time:.4f} s, "
+                          f"speedup x{serial_time / parallel_time:.2f}")
+
+                    store.append({
+                        "workers": workers,
+                        "speedup": serial_time / parallel_time,
+                        "dimension": dimension,
+                        "time": parallel_time,
+                        "recursion_calls": recursion_calls,
+                        "depth": max_recursion_depth,
+                        "swaps": swap_operations,
+                    })
+
+    store.close()
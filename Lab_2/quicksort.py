@@ -1,11 +1,28 @@
+import math
+import os
+import sys
 import time
 from random import choice, uniform
 
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_1"))
+from bench_runner import run_cells
+from insertion_sort import insertion_sort
+import radix_sort
+from results_store import QUICKSORT_COLUMNS, ResultsStore
+
 
 recursion_calls = 0
 max_recursion_depth = 0
 swap_operations = 0
 
+# Диапазоны не длиннее этого порога досортировываются вставками
+INSERTION_CUTOFF = 16
+# Начиная с этой длины опорный элемент выбирается как псевдомедиана девяти (ninther)
+NINTHER_THRESHOLD = 40
+
 
 def quicksort(nums, depth=0):
     global recursion_calls, max_recursion_depth, swap_operations
@@ -26,31 +43,217 @@ def quicksort(nums, depth=0):
         return quicksort(l_nums, depth + 1) + e_nums + quicksort(b_nums, depth + 1)
 
 
+# ---------- Introsort на месте ----------
+
+def _insertion_sort(nums, lo, hi):
+    """Сортировка вставками диапазона nums[lo..hi] (Lab_1). Возвращает число сдвигов."""
+    return insertion_sort(nums, lo, hi + 1)[1]
+
+
+def _median_of_three(nums, a, b, c):
+    """Индекс медианы из nums[a], nums[b], nums[c]"""
+    x, y, z = nums[a], nums[b], nums[c]
+    if x < y:
+        if y < z:
+            return b
+        return c if x < z else a
+    if x < z:
+        return a
+    return c if y < z else b
+
+
+def _choose_pivot(nums, lo, hi):
+    """Медиана трёх для коротких диапазонов и ninther Тьюки для длинных"""
+    size = hi - lo + 1
+    mid = lo + size // 2
+    if size >= NINTHER_THRESHOLD:
+        step = size // 8
+        a = _median_of_three(nums, lo, lo + step, lo + 2 * step)
+        b = _median_of_three(nums, mid - step, mid, mid + step)
+        c = _median_of_three(nums, hi - 2 * step, hi - step, hi)
+        return nums[_median_of_three(nums, a, b, c)]
+    return nums[_median_of_three(nums, lo, mid, hi)]
+
+
+def _partition3(nums, lo, hi, pivot):
+    """
+    Трёхпутевое разбиение (флаг Дейкстры) диапазона nums[lo..hi].
+    Возвращает (lt, gt, swaps): nums[lt..gt] равны pivot.
+    """
+    lt, i, gt = lo, lo, hi
+    swaps = 0
+    while i <= gt:
+        x = nums[i]
+        if x < pivot:
+            nums[i] = nums[lt]
+            nums[lt] = x
+            lt += 1
+            i += 1
+            swaps += 1
+        elif x > pivot:
+            nums[i] = nums[gt]
+            nums[gt] = x
+            gt -= 1
+            swaps += 1
+        else:
+            i += 1
+    return lt, gt, swaps
+
+
+def _heapsort(nums, lo, hi):
+    """Пирамидальная сортировка диапазона nums[lo..hi]. Возвращает число обменов."""
+    size = hi - lo + 1
+    swaps = 0
+
+    def sift_down(root, end):
+        nonlocal swaps
+        x = nums[lo + root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and nums[lo + child + 1] > nums[lo + child]:
+                child += 1
+            if nums[lo + child] <= x:
+                break
+            nums[lo + root] = nums[lo + child]
+            swaps += 1
+            root = child
+            child = 2 * root + 1
+        nums[lo + root] = x
+
+    for start in range(size // 2 - 1, -1, -1):
+        sift_down(start, size)
+    for end in range(size - 1, 0, -1):
+        nums[lo], nums[lo + end] = nums[lo + end], nums[lo]
+        swaps += 1
+        sift_down(0, end)
+    return swaps
+
+
+def _introsort_range(nums, lo, hi, depth=0, depth_limit=None, pivot_strategy=_choose_pivot):
+    """
+    Сортирует nums[lo..hi] на месте без рекурсии (явный стек диапазонов).
+    Возвращает (вызовы, максимальная глубина, обмены, переходы на heapsort).
+    depth_limit=None отключает переход на пирамидальную сортировку.
+    """
+    calls = 0
+    max_depth = depth
+    swaps = 0
+    fallbacks = 0
+    stack = [(lo, hi, depth)]
+
+    while stack:
+        lo, hi, depth = stack.pop()
+        calls += 1
+        if depth > max_depth:
+            max_depth = depth
+
+        if hi - lo < INSERTION_CUTOFF:
+            swaps += _insertion_sort(nums, lo, hi)
+            continue
+        if depth_limit is not None and depth >= depth_limit:
+            swaps += _heapsort(nums, lo, hi)
+            fallbacks += 1
+            continue
+
+        lt, gt, partition_swaps = _partition3(nums, lo, hi, pivot_strategy(nums, lo, hi))
+        swaps += partition_swaps
+
+        # Больший диапазон кладём первым, чтобы стек не превышал O(log n)
+        left = (lo, lt - 1, depth + 1)
+        right = (gt + 1, hi, depth + 1)
+        if lt - lo > hi - gt:
+            left, right = right, left
+        if right[0] < right[1]:
+            stack.append(right)
+        if left[0] < left[1]:
+            stack.append(left)
+
+    return calls, max_depth, swaps, fallbacks
+
+
+def introsort(nums):
+    """
+    Introsort на месте: трёхпутевое разбиение, ninther, вставки для коротких
+    диапазонов и пирамидальная сортировка при глубине больше 2*log2(n).
+    Обновляет те же счётчики, что и quicksort, и возвращает исходный список.
+    """
+    global recursion_calls, max_recursion_depth, swap_operations
+
+    if len(nums) <= 1:
+        recursion_calls += 1
+        return nums
+
+    depth_limit = 2 * int(math.log2(len(nums)))
+    calls, depth, swaps, _ = _introsort_range(nums, 0, len(nums) - 1, depth_limit=depth_limit)
+
+    recursion_calls += calls
+    max_recursion_depth = max(max_recursion_depth, depth)
+    swap_operations += swaps
+    return nums
+
+
+def radix(nums):
+    """
+    Поразрядная сортировка (radix_sort.py) списка на месте для сравнения в общем цикле замеров:
+    проходы по разрядам идут в recursion_calls, перемещения - в swap_operations
+    """
+    global recursion_calls, swap_operations
+
+    radix_sort.radix_passes = 0
+    radix_sort.move_operations = 0
+    arr = np.array(nums, dtype=np.float64)
+    radix_sort.radix_sort(arr)
+    nums[:] = arr.tolist()
+
+    recursion_calls += radix_sort.radix_passes
+    swap_operations += radix_sort.move_operations
+    return nums
+
+
+SORT_MODES = {
+    "copy": quicksort,
+    "inplace": introsort,
+    "radix": radix,
+}
+
+
+def benchmark_cell(cell, seed):
+    """Один замер для bench_runner: ячейка (режим, размерность, повтор)"""
+    global recursion_calls, max_recursion_depth, swap_operations
+
+    sort_mode, dimension, _ = cell
+    nums = [uniform(-1, 1) for _ in range(dimension)]
+
+    # Сброс счетчиков
+    recursion_calls = 0
+    max_recursion_depth = 0
+    swap_operations = 0
+
+    # Замер времени
+    start_time = time.time()
+    SORT_MODES[sort_mode](nums)
+    execution_time = time.time() - start_time
+
+    return {
+        "time": execution_time,
+        "recursion_calls": recursion_calls,
+        "depth": max_recursion_depth,
+        "swaps": swap_operations,
+    }
+
+
 if __name__ == "__main__":
 
+    # Режим сортировки и число процессов: python quicksort.py [copy|inplace|radix] [workers]
+    sort_mode = sys.argv[1] if len(sys.argv) > 1 else "inplace"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
     dimensions = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000]
+    cells = [(sort_mode, dimension, approach) for dimension in dimensions for approach in range(20)]
+
+    results = run_cells(benchmark_cell, cells, workers=workers)
 
-    for dimension in dimensions:
-        for approach in range(20):
-            nums = [uniform(-1, 1) for _ in range(dimension)]
-
-            # Сброс счетчиков
-            recursion_calls = 0
-            max_recursion_depth = 0
-            swap_operations = 0
-
-            # Замер времени
-            start_time = time.time()
-            sorted_nums = quicksort(nums)
-            end_time = time.time()
-            execution_time = end_time - start_time
-
-            # Запись результатов в файл
-            with open("results.txt", "a", encoding='UTF-8') as file:
-                file.write(
-                    f"Размерность: {dimension} "
-                    f"Время: {execution_time:.6f} "
-                    f"Количество вызовов рекурсии: {recursion_calls} "
-                    f"Глубина рекурсии: {max_recursion_depth} "
-                    f"Количество обменов: {swap_operations}\n"
-                )
+    # Запись результатов одной пачкой
+    with ResultsStore("results.csv", QUICKSORT_COLUMNS, npz_path="results.npz") as store:
+        for result in results:
+            store.append({"dimension": result["cell"][1], **result})
@@ -0,0 +1,128 @@
+import math
+import time
+
+import numpy as np
+
+from quicksort import _introsort_range
+from results_store import QUICKSORT_COLUMNS, ResultsStore
+
+
+recursion_calls = 0
+max_recursion_depth = 0
+swap_operations = 0
+
+# Диапазоны короче порога сортируются чисто питоновским ядром из quicksort.py
+VECTOR_THRESHOLD = 4096
+# Число элементов выборки, по которой выбирается опорный элемент
+PIVOT_SAMPLE = 9
+
+
+def _choose_pivot(arr, lo, hi):
+    """Медиана равномерной выборки из nums[lo..hi] (нечётный размер - значение из массива)"""
+    sample = arr[np.linspace(lo, hi, PIVOT_SAMPLE).astype(np.intp)]
+    return np.partition(sample, PIVOT_SAMPLE // 2)[PIVOT_SAMPLE // 2]
+
+
+def _partition3(arr, lo, hi, pivot):
+    """
+    Векторизованное трёхпутевое разбиение arr[lo..hi] булевыми масками.
+    Возвращает (lt, gt, swaps) в тех же обозначениях, что и quicksort._partition3.
+    """
+    segment = arr[lo:hi + 1]
+    less = segment < pivot
+    greater = segment > pivot
+    n_less = int(np.count_nonzero(less))
+    n_greater = int(np.count_nonzero(greater))
+    n_equal = segment.size - n_less - n_greater
+
+    # Средняя часть - сами элементы, а не копии pivot (сохраняется, например, -0.0)
+    segment[:] = np.concatenate((segment[less], segment[~(less | greater)], segment[greater]))
+    return lo + n_less, lo + n_less + n_equal - 1, n_less + n_greater
+
+
+def quicksort_numpy(arr, threshold=VECTOR_THRESHOLD):
+    """
+    Быстрая сортировка numpy.ndarray (float64) на месте.
+    Крупные диапазоны разбиваются векторно, короткие - питоновским ядром introsort.
+    Обновляет те же счётчики, что и quicksort.quicksort, и возвращает исходный массив.
+    """
+    global recursion_calls, max_recursion_depth, swap_operations
+
+    if arr.size <= 1:
+        recursion_calls += 1
+        return arr
+
+    if arr.dtype.kind == "f":
+        # NaN не сравнимы ни с чем: как и np.sort, переносим их в конец и сортируем остальное
+        nan = np.isnan(arr)
+        if nan.any():
+            arr[:] = np.concatenate((arr[~nan], arr[nan]))
+            quicksort_numpy(arr[:arr.size - int(np.count_nonzero(nan))], threshold)
+            return arr
+
+    depth_limit = 2 * int(math.log2(arr.size))
+    stack = [(0, arr.size - 1, 0)]
+
+    while stack:
+        lo, hi, depth = stack.pop()
+
+        if hi - lo + 1 <= threshold:
+            # Короткий диапазон: один раз переводим в список и обратно
+            segment = arr[lo:hi + 1].tolist()
+            calls, sub_depth, swaps, _ = _introsort_range(
+                segment, 0, len(segment) - 1, depth=depth, depth_limit=depth_limit
+            )
+            arr[lo:hi + 1] = segment
+            recursion_calls += calls
+            max_recursion_depth = max(max_recursion_depth, sub_depth)
+            swap_operations += swaps
+            continue
+
+        recursion_calls += 1
+        max_recursion_depth = max(max_recursion_depth, depth)
+
+        if depth >= depth_limit:
+            arr[lo:hi + 1].sort(kind="heapsort")
+            continue
+
+        lt, gt, swaps = _partition3(arr, lo, hi, _choose_pivot(arr, lo, hi))
+        swap_operations += swaps
+
+        if lo < lt - 1:
+            stack.append((lo, lt - 1, depth + 1))
+        if gt + 1 < hi:
+            stack.append((gt + 1, hi, depth + 1))
+
+    return arr
+
+
+if __name__ == "__main__":
+
+    dimensions = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000, 10 ** 6, 10 ** 7]
+    rng = np.random.default_rng()
+    store = ResultsStore("results_numpy.csv", QUICKSORT_COLUMNS, npz_path="results_numpy.npz")
+
+    for dimension in dimensions:
+        for approach in range(20):
+            nums = rng.uniform(-1, 1, dimension)
+
+            # Сброс счетчиков
+            recursion_calls = 0
+            max_recursion_depth = 0
+            swap_operations = 0
+
+            # Замер времени
+            start_time = time.time()
+            quicksort_numpy(nums)
+            end_time = time.time()
+            execution_time = end_time - start_time
+
+            store.append({
+                "dimension": dimension,
+                "time": execution_time,
+                "recursion_calls": recursion_calls,
+                "depth": max_recursion_depth,
+                "swaps": swap_operations,
+            })
+
+    store.close()
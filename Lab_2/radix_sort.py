@@ -0,0 +1,135 @@
+import time
+
+import numpy as np
+
+from results_store import ResultsStore
+
+
+radix_passes = 0
+move_operations = 0
+
+# Разряд LSD - 16 бит: stable argsort numpy для uint16 сам выполняется сортировкой подсчётом
+RADIX_BITS = 16
+# Целые ключи с разбросом меньше порога сортируются одним подсчётом
+COUNTING_RANGE = 1 << 20
+
+SIGN_BIT = np.uint64(1 << 63)
+ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+RADIX_COLUMNS = [
+    ("algorithm", "U16"),
+    ("dimension", "i8"),
+    ("time", "f8"),
+    ("passes", "i8"),
+    ("moves", "i8"),
+]
+
+
+def _float_keys(arr):
+    """
+    Отображение float64 -> uint64 с сохранением порядка: у неотрицательных чисел
+    инвертируется знаковый бит, у отрицательных - все биты
+    """
+    bits = arr.view(np.uint64)
+    return bits ^ np.where(bits & SIGN_BIT, ALL_BITS, SIGN_BIT)
+
+
+def _float_values(keys):
+    return (keys ^ np.where(keys & SIGN_BIT, SIGN_BIT, ALL_BITS)).view(np.float64)
+
+
+def counting_sort(arr):
+    """Сортировка подсчётом целочисленного массива с небольшим разбросом значений, на месте"""
+    global radix_passes, move_operations
+
+    # Смещения считаются в uint64 по модулю 2^64: разброс мал, а переполнения
+    # узких типов (int8, uint8 на всём диапазоне) так не возникает
+    lo = np.asarray(arr.min()).astype(np.uint64)
+    counts = np.bincount((arr.astype(np.uint64) - lo).astype(np.intp))
+    arr[:] = np.repeat((lo + np.arange(counts.size, dtype=np.uint64)).astype(arr.dtype), counts)
+    radix_passes += 1
+    move_operations += arr.size
+    return arr
+
+
+def radix_sort(arr):
+    """
+    LSD поразрядная сортировка numpy-массива int64 или float64 на месте.
+    Целые ключи с маленьким разбросом идут через counting_sort, проходы
+    по разрядам, в которых у всех ключей одна и та же цифра, пропускаются.
+    """
+    global radix_passes, move_operations
+
+    if arr.size <= 1:
+        return arr
+
+    if arr.dtype.kind in "iu":
+        if int(arr.max()) - int(arr.min()) < COUNTING_RANGE:
+            return counting_sort(arr)
+        if arr.dtype.kind == "u":
+            # Беззнаковые ключи уже упорядочены как uint64, знаковый бит не инвертируется
+            keys = arr.astype(np.uint64)
+        else:
+            keys = arr.astype(np.int64).view(np.uint64) ^ SIGN_BIT
+    elif arr.dtype == np.float64:
+        keys = _float_keys(arr)
+    else:
+        raise TypeError(f"radix_sort: unsupported dtype {arr.dtype}")
+
+    mask = np.uint64((1 << RADIX_BITS) - 1)
+    for shift in range(0, 64, RADIX_BITS):
+        digits = ((keys >> np.uint64(shift)) & mask).astype(np.uint16)
+        if np.all(digits == digits[0]):
+            continue
+        keys = keys[np.argsort(digits, kind="stable")]
+        radix_passes += 1
+        move_operations += arr.size
+
+    if arr.dtype.kind == "u":
+        arr[:] = keys
+    elif arr.dtype.kind == "i":
+        arr[:] = (keys ^ SIGN_BIT).view(np.int64)
+    else:
+        arr[:] = _float_values(keys)
+    return arr
+
+
+if __name__ == "__main__":
+    # Импорт здесь: quicksort.py сам подключает этот модуль как режим "radix"
+    import quicksort_numpy
+
+    dimensions = [1000, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+    # Быструю сортировку на 10^8 элементов не дожидаемся
+    quicksort_limit = 10 ** 7
+    rng = np.random.default_rng()
+
+    with ResultsStore("results_radix.csv", RADIX_COLUMNS) as store:
+        for dimension in dimensions:
+            for approach in range(5):
+                inputs = {
+                    "radix_float": rng.uniform(-1, 1, dimension),
+                    "radix_int": rng.integers(0, dimension, dimension, dtype=np.int64),
+                }
+                if dimension <= quicksort_limit:
+                    inputs["quicksort"] = rng.uniform(-1, 1, dimension)
+
+                for algorithm, nums in inputs.items():
+                    radix_passes = 0
+                    move_operations = 0
+                    quicksort_numpy.recursion_calls = 0
+                    quicksort_numpy.swap_operations = 0
+
+                    start_time = time.time()
+                    if algorithm == "quicksort":
+                        quicksort_numpy.quicksort_numpy(nums)
+                    else:
+                        radix_sort(nums)
+                    execution_time = time.time() - start_time
+
+                    store.append({
+                        "algorithm": algorithm,
+                        "dimension": dimension,
+                        "time": execution_time,
+                        "passes": radix_passes if algorithm != "quicksort" else quicksort_numpy.recursion_calls,
+                        "moves": move_operations if algorithm != "quicksort" else quicksort_numpy.swap_operations,
+                    })
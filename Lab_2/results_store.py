@@ -0,0 +1,96 @@
+import csv
+import os
+
+import numpy as np
+
+
+# ---------- Схемы таблиц результатов ----------
+# Столбец задаётся парой (имя, numpy dtype)
+
+QUICKSORT_COLUMNS = [
+    ("dimension", "i8"),
+    ("time", "f8"),
+    ("recursion_calls", "i8"),
+    ("depth", "i8"),
+    ("swaps", "i8"),
+]
+
+NEGATIVE_CASE_COLUMNS = [
+    ("test", "U96"),
+    ("dimension", "i8"),
+    ("time", "f8"),
+    ("recursion_calls", "i8"),
+    ("depth", "i8"),
+    ("swaps", "i8"),
+    ("fallbacks", "i8"),
+]
+
+
+# ---------- Буферизованное хранилище ----------
+class ResultsStore:
+    """
+    Копит строки результатов в памяти и дописывает их в CSV пачками
+    по buffer_size строк. Если задан npz_path, при закрытии вся таблица
+    дополнительно сохраняется в компактном столбцовом формате .npz.
+    """
+
+    def __init__(self, path, columns, npz_path=None, buffer_size=100000):
+        self.path = path
+        self.columns = columns
+        self.npz_path = npz_path
+        self.buffer_size = buffer_size
+        self._rows = []
+
+    def append(self, row):
+        """Добавляет строку-словарь с ключами из схемы"""
+        self._rows.append(tuple(row[name] for name, _ in self.columns))
+        if len(self._rows) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """Дописывает накопленные строки в CSV одной операцией"""
+        if not self._rows:
+            return
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            if write_header:
+                writer.writerow(name for name, _ in self.columns)
+            writer.writerows(self._rows)
+        self._rows.clear()
+
+    def close(self):
+        self.flush()
+        if self.npz_path is not None:
+            save_npz(self.npz_path, load_results(self.path, self.columns))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# ---------- Загрузка ----------
+
+def save_npz(path, table):
+    np.savez(path, **table)
+
+
+def load_results(path, columns=None):
+    """
+    Загружает таблицу результатов в словарь {столбец: numpy.ndarray}.
+    Для CSV нужна схема columns, .npz хранит типы сам.
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+
+    dtype = np.dtype([(name, kind) for name, kind in columns])
+    table = np.loadtxt(path, dtype=dtype, delimiter=",", skiprows=1,
+                       quotechar='"', encoding="utf-8", ndmin=1)
+    return {name: table[name] for name, _ in columns}
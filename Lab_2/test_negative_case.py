@@ -1,9 +1,19 @@
+import math
+import os
+import sys
 import time
-from random import choice, uniform
+from random import choice, randint, uniform
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_runner import run_cells
+import mergesort
+from results_store import NEGATIVE_CASE_COLUMNS, ResultsStore
+from quicksort import _choose_pivot, _introsort_range, _median_of_three
 
 recursion_calls = 0
 max_recursion_depth = 0
 swap_operations = 0
+heapsort_fallbacks = 0
 
 
 def quicksort(nums, depth=0):
@@ -44,59 +54,291 @@ def quicksort_deterministic(nums, depth=0):
         return quicksort_deterministic(l_nums, depth + 1) + e_nums + quicksort_deterministic(b_nums, depth + 1)
 
 
-def test_negative_case(test_type, nums, sort_function, results_file):
-    global recursion_calls, max_recursion_depth, swap_operations
+# ---------- Стратегии выбора опорного элемента ----------
+# Стратегия получает список и границы диапазона nums[lo..hi] и возвращает значение опорного элемента
+
+def pivot_middle(nums, lo, hi):
+    """Средний элемент, как в quicksort_deterministic"""
+    return nums[(lo + hi) // 2]
+
+
+def pivot_random(nums, lo, hi):
+    """Случайный элемент диапазона"""
+    return nums[randint(lo, hi)]
+
+
+def pivot_median_of_three(nums, lo, hi):
+    """Медиана первого, среднего и последнего элементов"""
+    return nums[_median_of_three(nums, lo, (lo + hi) // 2, hi)]
+
+
+def pivot_ninther(nums, lo, hi):
+    """Псевдомедиана девяти элементов Тьюки (для коротких диапазонов - медиана трёх)"""
+    return _choose_pivot(nums, lo, hi)
+
+
+def _select(values, k):
+    """k-я порядковая статистика за гарантированное O(n) (алгоритм BFPRT)"""
+    while len(values) > 5:
+        medians = [sorted(values[i:i + 5])[(min(5, len(values) - i) - 1) // 2]
+                   for i in range(0, len(values), 5)]
+        pivot = _select(medians, len(medians) // 2)
+
+        lows = [x for x in values if x < pivot]
+        highs = [x for x in values if pivot < x]
+        equal_count = len(values) - len(lows) - len(highs)
+
+        if k < len(lows):
+            values = lows
+        elif k < len(lows) + equal_count:
+            return pivot
+        else:
+            k -= len(lows) + equal_count
+            values = highs
+    return sorted(values)[k]
+
+
+def pivot_median_of_medians(nums, lo, hi):
+    """Точная медиана диапазона через медиану медиан: глубина разбиения не больше log2(n)"""
+    return _select(nums[lo:hi + 1], (hi - lo) // 2)
+
+
+PIVOT_STRATEGIES = {
+    "middle": pivot_middle,
+    "random": pivot_random,
+    "median_of_three": pivot_median_of_three,
+    "ninther": pivot_ninther,
+    "median_of_medians": pivot_median_of_medians,
+}
+
+
+def quicksort_pivot(nums, pivot_strategy="median_of_three", fallback=True):
+    """
+    Быстрая сортировка на месте с выбранной стратегией опорного элемента.
+    При fallback=True на глубине больше 2*log2(n) диапазон досортировывается
+    пирамидальной сортировкой, а переход учитывается в heapsort_fallbacks.
+    """
+    global recursion_calls, max_recursion_depth, swap_operations, heapsort_fallbacks
+
+    if len(nums) <= 1:
+        recursion_calls += 1
+        return nums
+
+    depth_limit = 2 * int(math.log2(len(nums))) if fallback else None
+    calls, depth, swaps, fallbacks = _introsort_range(
+        nums, 0, len(nums) - 1, depth_limit=depth_limit, pivot_strategy=PIVOT_STRATEGIES[pivot_strategy]
+    )
+
+    recursion_calls += calls
+    max_recursion_depth = max(max_recursion_depth, depth)
+    swap_operations += swaps
+    heapsort_fallbacks += fallbacks
+    return nums
+
+
+# ---------- Враждебные входные данные ----------
+
+def organ_pipe(size):
+    """Возрастающая, затем убывающая последовательность: 0 1 2 ... k ... 2 1 0"""
+    half = size // 2
+    return list(range(half)) + list(range(size - half - 1, -1, -1))
+
+
+def sawtooth(size, teeth=16):
+    """Повторяющиеся возрастающие отрезки"""
+    period = max(1, size // teeth)
+    return [i % period for i in range(size)]
+
+
+class _McIlroyAdversary:
+    """
+    Противник Макилроя ("A Killer Adversary for Quicksort"): значения элементов
+    фиксируются только в момент сравнения так, чтобы опорный элемент оказался
+    на краю диапазона.
+    """
+
+    def __init__(self, size):
+        self.gas = size
+        self.values = [size] * size
+        self.solid = 0
+        self.candidate = 0
+
+    def freeze(self, index):
+        self.values[index] = self.solid
+        self.solid += 1
+
+    def compare(self, x, y):
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            self.freeze(x if x == self.candidate else y)
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+
+class _GasItem:
+    __slots__ = ("adversary", "index")
+
+    def __init__(self, adversary, index):
+        self.adversary = adversary
+        self.index = index
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+    def __gt__(self, other):
+        return self.adversary.compare(self.index, other.index) > 0
+
+    def __le__(self, other):
+        return self.adversary.compare(self.index, other.index) <= 0
+
+    def __ge__(self, other):
+        return self.adversary.compare(self.index, other.index) >= 0
+
+
+def mcilroy_killer(size, pivot_strategy):
+    """Строит вход, на котором quicksort_pivot с данной стратегией деградирует"""
+    global recursion_calls, max_recursion_depth, swap_operations, heapsort_fallbacks
+
+    adversary = _McIlroyAdversary(size)
+    items = [_GasItem(adversary, i) for i in range(size)]
+
+    # Прогон против противника не должен портить счётчики измеряемого запуска
+    saved = recursion_calls, max_recursion_depth, swap_operations, heapsort_fallbacks
+    quicksort_pivot(items, pivot_strategy)
+    recursion_calls, max_recursion_depth, swap_operations, heapsort_fallbacks = saved
+
+    for i in range(size):
+        if adversary.values[i] == adversary.gas:
+            adversary.freeze(i)
+    return adversary.values
+
+
+ADVERSARIAL_GENERATORS = {
+    "Органная труба": lambda size, strategy: organ_pipe(size),
+    "Пила": lambda size, strategy: sawtooth(size),
+    "Убийца Макилроя": mcilroy_killer,
+}
+
+
+def measure_negative_case(nums, sort_function):
+    """Сортирует nums и возвращает время и счётчики одного запуска"""
+    global recursion_calls, max_recursion_depth, swap_operations, heapsort_fallbacks
 
     recursion_calls = 0
     max_recursion_depth = 0
     swap_operations = 0
+    heapsort_fallbacks = 0
 
     start_time = time.time()
-    sorted_nums = sort_function(nums)
+    sort_function(nums)
     end_time = time.time()
 
-    with open(results_file, "a", encoding="UTF-8") as file:
-        file.write(
-            f"Тест: {test_type} "
-            f"Размер массива: {len(nums)} "
-            f"Время выполнения: {end_time - start_time:.6f} "
-            f"Рекурсии: {recursion_calls} "
-            f"Максимальная глубина: {max_recursion_depth} "
-            f"Операции замены: {swap_operations}\n"
-        )
+    return {
+        "time": end_time - start_time,
+        "recursion_calls": recursion_calls,
+        "depth": max_recursion_depth,
+        "swaps": swap_operations,
+        "fallbacks": heapsort_fallbacks,
+    }
 
 
-if __name__ == "__main__":
+test_cases = [
+    {
+        "name": "Отсортированный массив",
+        "generator": lambda size: list(range(size)),
+        "sort_function": quicksort,
+    },
+    {
+        "name": "Массив с одинаковыми элементами",
+        "generator": lambda size: [0.1] * size,
+        "sort_function": quicksort,
+    },
+    {
+        "name": "Обратно отсортированный массив (Средний как pivot)",
+        "generator": lambda size: list(uniform(0, -1) for _ in range(size)),
+        "sort_function": quicksort,
+    },
+    {
+        "name": "Обратно отсортированный массив (Детерминированный pivot)",
+        "generator": lambda size: list(uniform(0, -1) for _ in range(size)),
+        "sort_function": quicksort_deterministic,
+    },
+]
+
+# Каждая стратегия опорного элемента против каждого враждебного генератора.
+# Стратегия не деградирует, если на всех входах "Переходы на heapsort" равны 0.
+pivot_test_cases = [
+    {
+        "name": f"{generator_name} (pivot: {strategy})",
+        "generator": lambda size, generator=generator, strategy=strategy: generator(size, strategy),
+        "sort_function": lambda nums, strategy=strategy: quicksort_pivot(nums, strategy),
+    }
+    for strategy in PIVOT_STRATEGIES
+    for generator_name, generator in ADVERSARIAL_GENERATORS.items()
+]
+
+
+def mergesort_counted(nums):
+    """
+    natural_mergesort со счётчиками этого модуля: слияния идут в "Рекурсии",
+    высота стека серий - в "Максимальная глубина", перемещения - в "Операции замены"
+    """
+    global recursion_calls, max_recursion_depth, swap_operations
+
+    mergesort.merge_calls = 0
+    mergesort.max_run_stack = 0
+    mergesort.move_operations = 0
+    mergesort.natural_mergesort(nums)
+    recursion_calls += mergesort.merge_calls
+    max_recursion_depth = max(max_recursion_depth, mergesort.max_run_stack)
+    swap_operations += mergesort.move_operations
+    return nums
+
 
-    results_file = "testing.txt"
-
-    test_cases = [
-        {
-            "name": "Отсортированный массив",
-            "generator": lambda size: list(range(size)),
-            "sort_function": quicksort,
-        },
-        {
-            "name": "Массив с одинаковыми элементами",
-            "generator": lambda size: [0.1] * size,
-            "sort_function": quicksort,
-        },
-        {
-            "name": "Обратно отсортированный массив (Средний как pivot)",
-            "generator": lambda size: list(uniform(0, -1) for _ in range(dimension)),
-            "sort_function": quicksort,
-        },
-        {
-            "name": "Обратно отсортированный массив (Детерминированный pivot)",
-            "generator": lambda size: list(uniform(0, -1) for _ in range(dimension)),
-            "sort_function": quicksort_deterministic,
-        },
+# Те же негативные случаи для естественной сортировки слиянием
+mergesort_test_cases = [
+    {
+        "name": f"{name} (natural mergesort)",
+        "generator": generator,
+        "sort_function": mergesort_counted,
+    }
+    for name, generator in [
+        ("Отсортированный массив", lambda size: list(range(size))),
+        ("Массив с одинаковыми элементами", lambda size: [0.1] * size),
+        ("Обратно отсортированный массив", lambda size: list(range(size, 0, -1))),
+        ("Органная труба", organ_pipe),
+        ("Пила", sawtooth),
+        ("Случайный массив", lambda size: [uniform(-1, 1) for _ in range(size)]),
     ]
+]
+
+TESTS = {test["name"]: test for test in test_cases + pivot_test_cases + mergesort_test_cases}
+
+
+def negative_case_cell(cell, seed):
+    """Один замер для bench_runner: ячейка (название теста, размерность, повтор)"""
+    test_type, dimension, _ = cell
+    test = TESTS[test_type]
+    return measure_negative_case(test["generator"](dimension), test["sort_function"])
+
+
+if __name__ == "__main__":
+
+    results_file = "testing.csv"
+    # Число процессов: python test_negative_case.py [workers]
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
 
     dimensions = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000]
+    cells = [(test_type, dimension, approach)
+             for approach in range(20)
+             for test_type in TESTS
+             for dimension in dimensions]
+
+    results = run_cells(negative_case_cell, cells, workers=workers)
 
-    for _ in range(20):
-        for test in test_cases:
-            for dimension in dimensions:
-                nums = test["generator"](dimension)
-                test_negative_case(test["name"], nums, test["sort_function"], results_file)
+    with ResultsStore(results_file, NEGATIVE_CASE_COLUMNS, npz_path="testing.npz") as store:
+        for result in results:
+            store.append({"test": result["cell"][0], "dimension": result["cell"][1], **result})
@@ -1,14 +1,32 @@
-from typing import Generic, TypeVar, List, Iterator, Optional, Any
-from collections import namedtuple
+from typing import Generic, TypeVar, List, Iterator, Optional, Any, Iterable
+from array import array
+from collections import namedtuple, deque
+from contextlib import contextmanager
+import asyncio
 import random
+import threading
+import tracemalloc
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Типовой шаблон
 T = TypeVar('T')
 
 
+# Типизированные реализации ArrayStack[int] / ArrayStack[float] (заполняется ниже)
+TYPED_ARRAY_STACKS = {}
+
+
 # ---------- Реализация стека через массив ----------
 class ArrayStack(Generic[T]):
+    def __class_getitem__(cls, item):
+        # ArrayStack[int] / ArrayStack[float] - компактный стек на array.array,
+        # для остальных типов - обычный стек на списке
+        if cls is ArrayStack and item in TYPED_ARRAY_STACKS:
+            return TYPED_ARRAY_STACKS[item]
+        return super().__class_getitem__(item)
+
     def __init__(self):
         self._data: List[T] = []
 
@@ -30,30 +48,117 @@ class ArrayStack(Generic[T]):
         return reversed(self._data)
 
 
+# ---------- Типизированный стек на array.array ----------
+class TypedArrayStack(ArrayStack[T]):
+    """
+    Стек без упаковки значений в объекты: элементы лежат подряд в array.array
+    (8 байт на int/float вместо указателя и объекта). Рост буфера амортизирован array.
+    """
+    typecode = "q"
+
+    def __init__(self):
+        self._data = array(self.typecode)
+
+    def push_many(self, values: Iterable[T]) -> None:
+        """Кладёт значения по порядку (последнее окажется на вершине)"""
+        self._data.extend(values)
+
+    def pop_many(self, count: int) -> array:
+        """Снимает count значений, возвращает их в порядке извлечения"""
+        if count > len(self._data):
+            raise IndexError("pop from empty stack")
+        chunk = self._data[len(self._data) - count:]
+        del self._data[len(self._data) - count:]
+        chunk.reverse()
+        return chunk
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """
+        Представление буфера без копирования (от дна к вершине) на время блока with.
+        Пока блок не завершён, размер буфера менять нельзя: push и pop вызывают BufferError.
+        """
+        view = memoryview(self._data)
+        try:
+            yield view
+        finally:
+            view.release()
+
+    def __iter__(self) -> Iterator[T]:
+        # Обход по индексам, без memoryview: стек можно менять и во время обхода
+        data = self._data
+        for i in range(len(data) - 1, -1, -1):
+            if i < len(data):
+                yield data[i]
+
+
+class IntArrayStack(TypedArrayStack[int]):
+    typecode = "q"
+
+
+class FloatArrayStack(TypedArrayStack[float]):
+    typecode = "d"
+
+
+TYPED_ARRAY_STACKS.update({
+    int: IntArrayStack,
+    float: FloatArrayStack,
+})
+
+
 # ---------- Реализация стека через односвязный список ----------
 class LinkedListStack(Generic[T]):
-    class _Node(Generic[T]):
-        def __init__(self, value: T, next_: Optional['LinkedListStack._Node'] = None):
+    class _Node:
+        # __slots__ вместо __dict__: узел занимает 48 байт вместо ~150
+        __slots__ = ("value", "next")
+
+        def __init__(self, value, next_: Optional['LinkedListStack._Node'] = None):
             self.value = value
             self.next = next_
 
-    def __init__(self):
-        self._head: Optional[LinkedListStack._Node[T]] = None
+    # Сколько свободных узлов держать по умолчанию (около 200 КБ)
+    POOL_LIMIT = 4096
+
+    def __init__(self, pool_limit: Optional[int] = POOL_LIMIT):
+        self._head: Optional[LinkedListStack._Node] = None
         self._size = 0
+        # Пул освобождённых узлов: pop кладёт узел сюда, push берёт отсюда.
+        # Не больше pool_limit узлов; None - без ограничения (память пика не возвращается)
+        self._free: Optional[LinkedListStack._Node] = None
+        self._free_size = 0
+        self._pool_limit = pool_limit
 
     def push(self, value: T) -> None:
-        new_node = self._Node(value, self._head)
-        self._head = new_node
+        node = self._free
+        if node is not None:
+            self._free = node.next
+            self._free_size -= 1
+            node.value = value
+            node.next = self._head
+        else:
+            node = self._Node(value, self._head)
+        self._head = node
         self._size += 1
 
     def pop(self) -> T:
-        if self._head is None:
+        node = self._head
+        if node is None:
             raise IndexError("pop from empty stack")
-        value = self._head.value
-        self._head = self._head.next
+        value = node.value
+        self._head = node.next
         self._size -= 1
+        if self._pool_limit is None or self._free_size < self._pool_limit:
+            node.value = None
+            node.next = self._free
+            self._free = node
+            self._free_size += 1
         return value
 
+    def shrink(self) -> None:
+        """Отдаёт пул свободных узлов сборщику мусора"""
+        self._free = None
+        self._free_size = 0
+
     def is_empty(self) -> bool:
         return self._head is None
 
@@ -67,6 +172,213 @@ class LinkedListStack(Generic[T]):
             current = current.next
 
 
+# ---------- Развёрнутый связный список (unrolled linked list) ----------
+class UnrolledLinkedListStack(Generic[T]):
+    """
+    Стек на списке блоков: каждый узел хранит до chunk_size значений подряд,
+    поэтому на значение приходится один указатель вместо целого узла,
+    а соседние значения лежат рядом в памяти.
+    """
+
+    class _Chunk:
+        __slots__ = ("values", "next")
+
+        def __init__(self, next_: Optional['UnrolledLinkedListStack._Chunk'] = None):
+            self.values = []
+            self.next = next_
+
+    def __init__(self, chunk_size: int = 64):
+        self._chunk_size = chunk_size
+        self._head: Optional[UnrolledLinkedListStack._Chunk] = None
+        self._size = 0
+        # Один запасной блок, чтобы push/pop на границе блока не выделяли память каждый раз
+        self._spare: Optional[UnrolledLinkedListStack._Chunk] = None
+
+    def push(self, value: T) -> None:
+        head = self._head
+        if head is None or len(head.values) == self._chunk_size:
+            if self._spare is not None:
+                head, self._spare = self._spare, None
+                head.next = self._head
+            else:
+                head = self._Chunk(self._head)
+            self._head = head
+        head.values.append(value)
+        self._size += 1
+
+    def pop(self) -> T:
+        head = self._head
+        if head is None:
+            raise IndexError("pop from empty stack")
+        value = head.values.pop()
+        self._size -= 1
+        if not head.values:
+            self._head = head.next
+            head.next = None
+            self._spare = head
+        return value
+
+    def is_empty(self) -> bool:
+        return self._head is None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        chunk = self._head
+        while chunk is not None:
+            yield from reversed(chunk.values)
+            chunk = chunk.next
+
+
+# ---------- Потокобезопасный стек с блокировкой ----------
+class ConcurrentStack(Generic[T]):
+    """Стек для нескольких потоков: pop может ждать появления данных"""
+
+    def __init__(self):
+        self._data: List[T] = []
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def push(self, value: T) -> None:
+        with self._not_empty:
+            self._data.append(value)
+            self._not_empty.notify()
+
+    def pop(self, block: bool = False, timeout: Optional[float] = None) -> T:
+        """Без block ведёт себя как обычный стек; с block ждёт данных (не дольше timeout)"""
+        with self._not_empty:
+            if block and not self._not_empty.wait_for(lambda: self._data, timeout):
+                raise IndexError("pop from empty stack")
+            if not self._data:
+                raise IndexError("pop from empty stack")
+            return self._data.pop()
+
+    def is_empty(self) -> bool:
+        return len(self._data) == 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        # Обход снимка: другие потоки могут менять стек во время итерации
+        with self._not_empty:
+            snapshot = list(self._data)
+        return reversed(snapshot)
+
+
+# ---------- Стек Трайбера ----------
+class _AtomicReference:
+    """
+    Ссылка с операцией compare-and-set. В CPython нет аппаратного CAS,
+    поэтому сравнение и запись выполняются в коротком критическом участке.
+    """
+
+    def __init__(self, value=None):
+        self._value = value
+        self._lock = threading.Lock()
+
+    def get(self):
+        return self._value
+
+    def compare_and_set(self, expected, new) -> bool:
+        with self._lock:
+            if self._value is not expected:
+                return False
+            self._value = new
+            return True
+
+
+class TreiberStack(Generic[T]):
+    """
+    Неблокирующий стек Трайбера: вершина меняется только через CAS с повтором
+    при неудаче, узлы после публикации не изменяются. Блокировка держится
+    только на время одной CAS, а не всей операции.
+    """
+
+    class _Node:
+        __slots__ = ("value", "next")
+
+        def __init__(self, value, next_):
+            self.value = value
+            self.next = next_
+
+    def __init__(self):
+        self._head = _AtomicReference()
+        self._size = 0
+
+    def push(self, value: T) -> None:
+        while True:
+            head = self._head.get()
+            if self._head.compare_and_set(head, self._Node(value, head)):
+                self._size += 1
+                return
+
+    def pop(self) -> T:
+        while True:
+            head = self._head.get()
+            if head is None:
+                raise IndexError("pop from empty stack")
+            if self._head.compare_and_set(head, head.next):
+                self._size -= 1
+                return head.value
+
+    def is_empty(self) -> bool:
+        return self._head.get() is None
+
+    def __len__(self) -> int:
+        # Приблизительно при одновременных изменениях
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        # Узлы неизменяемы, поэтому обход от снимка вершины безопасен без блокировок
+        current = self._head.get()
+        while current is not None:
+            yield current.value
+            current = current.next
+
+
+# ---------- Стек для asyncio ----------
+class AsyncStack(Generic[T]):
+    """Стек для корутин одного цикла событий: await pop() ждёт, пока появятся данные"""
+
+    def __init__(self):
+        self._data: List[T] = []
+        self._getters = deque()
+
+    def push_nowait(self, value: T) -> None:
+        # Если кто-то уже ждёт, значение отдаётся ему напрямую
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(value)
+                return
+        self._data.append(value)
+
+    async def push(self, value: T) -> None:
+        self.push_nowait(value)
+
+    def pop_nowait(self) -> T:
+        if not self._data:
+            raise IndexError("pop from empty stack")
+        return self._data.pop()
+
+    async def pop(self) -> T:
+        if self._data:
+            return self._data.pop()
+        getter = asyncio.get_running_loop().create_future()
+        self._getters.append(getter)
+        return await getter
+
+    def is_empty(self) -> bool:
+        return len(self._data) == 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        return reversed(self._data)
+
+
 # ---------- Тесты ----------
 
 # Тест 1: Заполнение контейнера числами и подсчет характеристик
@@ -158,6 +470,113 @@ def test_person_data(stack_class: Any):
     print(f"  Below 20: {len(below_20)}, Above 30: {len(above_30)}")
 
 
+# ---------- Столбцовое хранилище людей ----------
+class PersonColumns:
+    """
+    Люди в виде структуры массивов: ФИО - коды в словарях интернированных строк,
+    даты рождения - столбец numpy datetime64[D]. Запросы по возрасту считаются
+    векторно по всему столбцу.
+    """
+    NAME_FIELDS = ("last_name", "first_name", "patronymic")
+
+    def __init__(self):
+        self.names = {field: [] for field in self.NAME_FIELDS}  # код -> строка
+        self._codes = {field: {} for field in self.NAME_FIELDS}  # строка -> код
+        self.name_codes = {field: np.empty(0, dtype=np.int32) for field in self.NAME_FIELDS}
+        self.birth_dates = np.empty(0, dtype="datetime64[D]")
+
+    def _intern(self, field, name):
+        codes = self._codes[field]
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(self.names[field])
+            self.names[field].append(name)
+        return code
+
+    def extend(self, people: Iterable[Person]) -> None:
+        """Добавляет людей одним пакетом (например, обход любого из стеков)"""
+        name_codes = {field: array("i") for field in self.NAME_FIELDS}
+        days = array("q")
+        for person in people:
+            for field in self.NAME_FIELDS:
+                name_codes[field].append(self._intern(field, getattr(person, field)))
+            days.append(person.birth_date.toordinal())
+
+        for field in self.NAME_FIELDS:
+            self.name_codes[field] = np.concatenate(
+                (self.name_codes[field], np.frombuffer(name_codes[field], dtype=np.int32)))
+        # toordinal() считает 0001-01-01 днём 1, datetime64[D] - от 1970-01-01
+        epoch = datetime(1970, 1, 1).toordinal()
+        dates = (np.frombuffer(days, dtype=np.int64) - epoch).astype("datetime64[D]")
+        self.birth_dates = np.concatenate((self.birth_dates, dates))
+
+    @classmethod
+    def from_stack(cls, stack) -> 'PersonColumns':
+        columns = cls()
+        columns.extend(stack)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.birth_dates)
+
+    def __getitem__(self, index: int) -> Person:
+        birth_date = self.birth_dates[index].astype(datetime)
+        return Person(*(self.names[field][self.name_codes[field][index]] for field in self.NAME_FIELDS),
+                      birth_date=datetime(birth_date.year, birth_date.month, birth_date.day))
+
+    def ages(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Возраст в полных годах, как в test_person_data: дни // 365"""
+        now = np.datetime64(now or datetime.now(), "D")
+        return (now - self.birth_dates).astype(np.int64) // 365
+
+    def age_mask(self, min_age: Optional[int] = None, max_age: Optional[int] = None,
+                 now: Optional[datetime] = None) -> np.ndarray:
+        """Маска людей с min_age <= возраст < max_age (любая граница может отсутствовать)"""
+        ages = self.ages(now)
+        mask = np.ones(len(ages), dtype=bool)
+        if min_age is not None:
+            mask &= ages >= min_age
+        if max_age is not None:
+            mask &= ages < max_age
+        return mask
+
+    def count_age_range(self, min_age: Optional[int] = None, max_age: Optional[int] = None,
+                        now: Optional[datetime] = None) -> int:
+        return int(np.count_nonzero(self.age_mask(min_age, max_age, now)))
+
+
+# Тест 3б: Столбцовое хранилище против построчного обхода
+def test_person_columns(stack_class: Any, count: int = 10 ** 6):
+    import time
+    stack = stack_class[Person]()
+    for _ in range(count):
+        stack.push(random_person())
+    now = datetime.now()
+
+    start = time.time()
+    below_20 = above_30 = 0
+    for person in stack:
+        age = (now - person.birth_date).days // 365
+        if age < 20:
+            below_20 += 1
+        elif age > 30:
+            above_30 += 1
+    loop_time = time.time() - start
+
+    start = time.time()
+    columns = PersonColumns.from_stack(stack)
+    fill_time = time.time() - start
+
+    start = time.time()
+    columnar = (columns.count_age_range(max_age=20, now=now), columns.count_age_range(min_age=31, now=now))
+    query_time = time.time() - start
+
+    print(f"Test Person Columns ({stack_class.__name__}, {count} records):")
+    print(f"  Loop: {loop_time:.4f} s, Below 20: {below_20}, Above 30: {above_30}")
+    print(f"  Columns: fill {fill_time:.4f} s, query {query_time:.4f} s, "
+          f"Below 20: {columnar[0]}, Above 30: {columnar[1]}")
+
+
 # Тест 4: Инвертирование содержимого
 def test_inversion(stack_class: Any):
     stack = stack_class[int]()
@@ -174,32 +593,141 @@ def test_inversion(stack_class: Any):
     print(f"  Inverted: {list(inverted_stack)}")
 
 
-# Тест 5: Сравнение производительности
+# Тест 5: Сравнение производительности и занимаемой памяти
+COMPARISON_OPERATIONS = 10 ** 7
+
+
+def measure_stack(stack_factory, data, rounds=2):
+    """
+    Время rounds циклов push+pop всех значений (со второго цикла работает пул узлов)
+    и память, занятая заполненным стеком
+    """
+    import time
+    stack = stack_factory()
+    start = time.time()
+    for _ in range(rounds):
+        for value in data:
+            stack.push(value)
+        for _ in data:
+            stack.pop()
+    elapsed = time.time() - start
+
+    # Память меряется отдельным проходом: tracemalloc сильно замедляет выделения
+    tracemalloc.start()
+    stack = stack_factory()
+    for value in data:
+        stack.push(value)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, memory
+
+
 def test_comparison():
+    # range отдаёт новые объекты int, как при реальном заполнении стека
+    data = range(COMPARISON_OPERATIONS)
+
+    stacks = [
+        ("ArrayStack (list)", ArrayStack),
+        ("ArrayStack[int] (array)", ArrayStack[int]),
+        ("LinkedListStack", LinkedListStack[int]),
+        ("UnrolledLinkedListStack", UnrolledLinkedListStack[int]),
+    ]
+
+    print("Comparison:")
+    for name, stack_factory in stacks:
+        elapsed, memory = measure_stack(stack_factory, data)
+        print(f"  {name} Time: {elapsed:.5f} s, Memory: {memory / 1024:.1f} KiB")
+
+    # Пакетные операции типизированного стека
     import time
-    array_stack = ArrayStack[int]()
-    linked_list_stack = LinkedListStack[int]()
-    data = list(range(10000))
+    stack = ArrayStack[int]()
+    start = time.time()
+    stack.push_many(data)
+    stack.pop_many(len(data))
+    print(f"  ArrayStack[int] push_many/pop_many Time: {time.time() - start:.5f} s")
+
+
+# Тест 6: Производители и потребители
+class _LockedStack:
+    """Обычный стек под внешней блокировкой - для сравнения с потокобезопасными"""
 
-    # Тест скорости ArrayStack
+    def __init__(self, stack):
+        self._stack = stack
+        self._lock = threading.Lock()
+
+    def push(self, value):
+        with self._lock:
+            self._stack.push(value)
+
+    def pop(self):
+        with self._lock:
+            return self._stack.pop()
+
+
+def _run_threads(stack, producers, consumers, operations, blocking):
+    """Пропускная способность (операций/с) при producers писателях и consumers читателях"""
+    import time
+    per_producer = operations // producers
+    total = per_producer * producers
+    per_consumer = [total // consumers + (1 if i < total % consumers else 0) for i in range(consumers)]
+
+    def produce():
+        for value in range(per_producer):
+            stack.push(value)
+
+    def consume(count):
+        while count:
+            try:
+                stack.pop(block=True) if blocking else stack.pop()
+                count -= 1
+            except IndexError:
+                time.sleep(0)
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    threads += [threading.Thread(target=consume, args=(count,)) for count in per_consumer]
     start = time.time()
-    for value in data:
-        array_stack.push(value)
-    for _ in data:
-        array_stack.pop()
-    array_time = time.time() - start
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return 2 * total / (time.time() - start)
+
+
+async def _run_tasks(producers, consumers, operations):
+    import time
+    stack = AsyncStack[int]()
+    per_producer = operations // producers
+    total = per_producer * producers
+    per_consumer = [total // consumers + (1 if i < total % consumers else 0) for i in range(consumers)]
+
+    async def produce():
+        for value in range(per_producer):
+            await stack.push(value)
+            if value % 1000 == 0:
+                await asyncio.sleep(0)
+
+    async def consume(count):
+        for _ in range(count):
+            await stack.pop()
 
-    # Тест скорости LinkedListStack
     start = time.time()
-    for value in data:
-        linked_list_stack.push(value)
-    for _ in data:
-        linked_list_stack.pop()
-    linked_time = time.time() - start
+    await asyncio.gather(*[consume(count) for count in per_consumer],
+                         *[produce() for _ in range(producers)])
+    return 2 * total / (time.time() - start)
 
-    print("Comparison:")
-    print(f"  ArrayStack Time: {array_time:.5f} s")
-    print(f"  LinkedListStack Time: {linked_time:.5f} s")
+
+def test_contention(max_workers: int = 4, operations: int = 100000):
+    print("Contention (operations/s):")
+    for workers in range(1, max_workers + 1):
+        results = {
+            "ArrayStack + Lock": _run_threads(_LockedStack(ArrayStack()), workers, workers, operations, False),
+            "LinkedListStack + Lock": _run_threads(_LockedStack(LinkedListStack()), workers, workers, operations, False),
+            "ConcurrentStack": _run_threads(ConcurrentStack(), workers, workers, operations, True),
+            "TreiberStack": _run_threads(TreiberStack(), workers, workers, operations, False),
+            "AsyncStack": asyncio.run(_run_tasks(workers, workers, operations)),
+        }
+        print(f"  {workers} producers / {workers} consumers: " +
+              ", ".join(f"{name}: {rate:.0f}" for name, rate in results.items()))
 
 
 # Запуск тестов
@@ -209,6 +737,9 @@ test_string_operations(ArrayStack)
 test_string_operations(LinkedListStack)
 test_person_data(ArrayStack)
 test_person_data(LinkedListStack)
+test_person_columns(ArrayStack)
+test_person_columns(LinkedListStack)
 test_inversion(ArrayStack)
 test_inversion(LinkedListStack)
 test_comparison()
+test_contention()
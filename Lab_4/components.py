@@ -0,0 +1,255 @@
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from graph import CSRGraph, RandomGraphGenerator
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_5"))
+from disjoint_set import DisjointSet
+
+
+# ---------- Общее ----------
+# Все обходы итеративные (явный стек вместо рекурсии), поэтому не упираются
+# в предел глубины рекурсии интерпретатора. Работают с Graph и CSRGraph:
+# смежность читается из CSR-массивов, переведённых в списки Python.
+
+def _undirected_csr(graph) -> CSRGraph:
+    """CSR, в котором каждое ребро доступно с обоих концов (ориентация игнорируется)"""
+    if isinstance(graph, CSRGraph) and not graph.directed:
+        return graph
+    return CSRGraph.from_edges(graph.vertices, graph.edges, directed=False)
+
+
+def _directed_csr(graph) -> CSRGraph:
+    return graph if isinstance(graph, CSRGraph) else graph.to_csr()
+
+
+# ---------- Компоненты связности ----------
+
+def connected_components(graph) -> Tuple[int, np.ndarray]:
+    """
+    Компоненты связности (для ориентированного графа - слабой) обходом в глубину
+    с явным стеком. Возвращает (число компонент, номер компоненты каждой вершины).
+    """
+    csr = _undirected_csr(graph)
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    labels = [-1] * csr.vertices
+    count = 0
+
+    for root in range(csr.vertices):
+        if labels[root] != -1:
+            continue
+        labels[root] = count
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if labels[w] == -1:
+                    labels[w] = count
+                    stack.append(w)
+        count += 1
+    return count, np.array(labels, dtype=np.int64)
+
+
+def connected_components_union_find(graph) -> Tuple[int, np.ndarray]:
+    """
+    Те же компоненты через систему непересекающихся множеств (Lab_5/disjoint_set.py):
+    один проход по списку рёбер. Нумерация совпадает с connected_components.
+    """
+    edges = np.asarray(graph.edges, dtype=np.int64).reshape(-1, 2)
+    components = DisjointSet(graph.vertices)
+    components.union_many(edges[:, 0], edges[:, 1])
+    return components.components, components.labels()
+
+
+# ---------- Сильно связные компоненты ----------
+
+def strongly_connected_components(graph) -> Tuple[int, np.ndarray]:
+    """
+    Алгоритм Тарьяна с явным стеком обхода. Компоненты нумеруются в порядке
+    завершения, т.е. в обратном топологическом порядке графа конденсации.
+    Для неориентированного графа совпадает с компонентами связности (с другой нумерацией).
+    """
+    csr = _directed_csr(graph)
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    vertices = csr.vertices
+
+    index = [-1] * vertices
+    low = [0] * vertices
+    on_stack = [False] * vertices
+    labels = [-1] * vertices
+    stack = []
+    counter = 0
+    count = 0
+
+    for root in range(vertices):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            v, i = work[-1]
+            end = indptr[v + 1]
+            while i < end:
+                w = indices[i]
+                i += 1
+                if index[w] == -1:
+                    # Спуск в w, продолжение v запоминается на стеке обхода
+                    work[-1] = (v, i)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        labels[w] = count
+                        if w == v:
+                            break
+                    count += 1
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+    return count, np.array(labels, dtype=np.int64)
+
+
+# ---------- Шарниры и мосты ----------
+
+def _lowlink(graph) -> Tuple[List[int], List[int]]:
+    """
+    Один итеративный обход в глубину по неориентированному графу с вычислением
+    времён входа и low. Родительское ребро пропускается по номеру, поэтому
+    кратные рёбра обрабатываются верно. Возвращает (шарниры, номера рёбер-мостов).
+    """
+    csr = _undirected_csr(graph)
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    edge_ids = csr.edge_ids.tolist()
+    vertices = csr.vertices
+
+    disc = [-1] * vertices
+    low = [0] * vertices
+    is_cut = [False] * vertices
+    bridges = []
+    timer = 0
+
+    for root in range(vertices):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        children = 0
+        work = [(root, -1, indptr[root])]
+
+        while work:
+            v, parent_edge, i = work[-1]
+            end = indptr[v + 1]
+            while i < end:
+                w = indices[i]
+                edge = edge_ids[i]
+                i += 1
+                if edge == parent_edge:
+                    continue
+                if disc[w] == -1:
+                    work[-1] = (v, parent_edge, i)
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    work.append((w, edge, indptr[w]))
+                    break
+                if disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                work.pop()
+                if not work:
+                    continue
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+                if low[v] > disc[u]:
+                    bridges.append(parent_edge)
+                if u == root:
+                    children += 1
+                elif low[v] >= disc[u]:
+                    is_cut[u] = True
+
+        if children > 1:
+            is_cut[root] = True
+
+    return [v for v in range(vertices) if is_cut[v]], sorted(bridges)
+
+
+def articulation_points(graph) -> List[int]:
+    """Шарниры - вершины, удаление которых увеличивает число компонент связности"""
+    return _lowlink(graph)[0]
+
+
+def bridges(graph) -> List[Tuple[int, int]]:
+    """Мосты - рёбра, удаление которых увеличивает число компонент связности (в порядке graph.edges)"""
+    edges = np.asarray(graph.edges, dtype=np.int64).reshape(-1, 2)
+    return [tuple(edge) for edge in edges[_lowlink(graph)[1]].tolist()]
+
+
+# ---------- Тесты производительности ----------
+
+def test_components():
+    vertices_range = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    algorithms = {
+        "Компоненты (DFS)": connected_components,
+        "Компоненты (union-find)": connected_components_union_find,
+        "Тарьян (ориентированный граф)": strongly_connected_components,
+        "Шарниры и мосты": _lowlink,
+    }
+    times = {name: [] for name in algorithms}
+
+    for num_vertices in vertices_range:
+        for directed in (False, True):
+            generator = RandomGraphGenerator(
+                min_vertices=num_vertices,
+                max_vertices=num_vertices,
+                min_edges=num_vertices,
+                max_edges=num_vertices,
+                max_edges_per_vertex=10,
+                directed=directed
+            )
+            graph = generator.generate_csr()
+
+            for name, algorithm in algorithms.items():
+                if directed != name.startswith("Тарьян"):
+                    continue
+                start_time = time.time()
+                algorithm(graph)
+                times[name].append(time.time() - start_time)
+
+    plt.figure(figsize=(10, 6))
+    for name, values in times.items():
+        plt.plot(vertices_range, values, label=name, marker="o")
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Количество вершин")
+    plt.ylabel("Время выполнения (секунды)")
+    plt.title("Компоненты связности, шарниры и мосты на случайных графах")
+    plt.legend()
+    plt.grid()
+    plt.show()
+
+
+if __name__ == "__main__":
+    test_components()
@@ -1,6 +1,8 @@
+import os
 import random
 import time
 import matplotlib.pyplot as plt
+import numpy as np
 from collections import defaultdict, deque
 from typing import List, Tuple, Dict, Optional
 
@@ -9,55 +11,502 @@ from typing import List, Tuple, Dict, Optional
 class Graph:
     def __init__(self, vertices: int, edges: List[Tuple[int, int]], directed: bool = False):
         self.vertices = vertices
-        self.edges = edges
         self.directed = directed
+        # Производные представления (матрицы, CSR), строятся по первому запросу
+        self._cache = {}
+        # Рёбра хранятся простым списком (копия переданного). Мультимножество
+        # рёбер для удаления за O(1) строится только при первом remove_edge
+        self._edge_list = list(edges)
+        self._edges = None  # номер -> ребро, в порядке добавления
+        self._copies = None  # ключ ребра -> номера его копий
+        self._next_id = 0
 
         # Генерация списка смежности
         self.adj_list = defaultdict(list)
-        for edge in edges:
+        for edge in self._edge_list:
             u, v = edge
             self.adj_list[u].append(v)
             if not directed:
                 self.adj_list[v].append(u)
 
-    def adjacency_matrix(self) -> List[List[int]]:
-        """Возвращает матрицу смежности"""
-        matrix = [[0] * self.vertices for _ in range(self.vertices)]
-        for u, v in self.edges:
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        """Список рёбер в порядке добавления (изменять нельзя)"""
+        if self._edges is None:
+            return self._edge_list
+        if "edges" not in self._cache:
+            self._cache["edges"] = list(self._edges.values())
+        return self._cache["edges"]
+
+    def _build_multiset(self):
+        """Переводит список рёбер в мультимножество (один раз, при первом удалении)"""
+        self._edges = dict(enumerate(map(tuple, self._edge_list)))
+        self._copies = defaultdict(list)
+        for i, (u, v) in self._edges.items():
+            self._copies[self._key(u, v)].append(i)
+        self._next_id = len(self._edges)
+        self._edge_list = None
+
+    def _key(self, u: int, v: int) -> Tuple[int, int]:
+        """Ключ ребра в мультимножестве: для неориентированного графа u - v и v - u совпадают"""
+        return (u, v) if self.directed or u <= v else (v, u)
+
+    # ---------- Изменение графа ----------
+    # Список смежности обновляется сразу. Закешированные матрицы дополняются
+    # на месте, если это дешевле перестроения, иначе сбрасываются и будут
+    # построены заново при следующем запросе.
+
+    def add_vertex(self) -> int:
+        """Добавляет изолированную вершину и возвращает её номер"""
+        v = self.vertices
+        self.vertices += 1
+        self._cache.pop("csr", None)
+        self._cache.pop("adjacency_bits", None)
+
+        matrix = self._cache.get("adjacency_matrix")
+        if matrix is not None:
+            for row in matrix:
+                row.append(0)
+            matrix.append([0] * self.vertices)
+        matrix = self._cache.get("incidence_matrix")
+        if matrix is not None:
+            matrix.append([0] * len(self.edges))
+        return v
+
+    def add_edge(self, u: int, v: int):
+        """Добавляет ребро u -> v (для неориентированного графа u - v)"""
+        if not (0 <= u < self.vertices and 0 <= v < self.vertices):
+            raise IndexError(f"edge ({u}, {v}): vertex out of range")
+        if self._edges is None:
+            self._edge_list.append((u, v))
+        else:
+            self._edges[self._next_id] = (u, v)
+            self._copies[self._key(u, v)].append(self._next_id)
+            self._next_id += 1
+            edges = self._cache.get("edges")
+            if edges is not None:
+                edges.append((u, v))
+        self.adj_list[u].append(v)
+        if not self.directed:
+            self.adj_list[v].append(u)
+        self._cache.pop("csr", None)
+
+        matrix = self._cache.get("adjacency_matrix")
+        if matrix is not None:
             matrix[u][v] = 1
             if not self.directed:
                 matrix[v][u] = 1
-        return matrix
+        bits = self._cache.get("adjacency_bits")
+        if bits is not None:
+            bits.set(u, v)
+        matrix = self._cache.get("incidence_matrix")
+        if matrix is not None:
+            for row in matrix:
+                row.append(0)
+            matrix[u][-1] = 1
+            matrix[v][-1] = 1 if not self.directed else -1
+
+    def remove_edge(self, u: int, v: int):
+        """
+        Удаляет одно ребро u -> v (для неориентированного графа - u - v в любой записи).
+        Из кратных рёбер удаляется добавленное последним, и из списков смежности -
+        последнее вхождение, так что порядок соседей совпадает с заново построенным графом.
+        """
+        if self._edges is None:
+            self._build_multiset()
+        key = self._key(u, v)
+        copies = self._copies.get(key)
+        if not copies:
+            raise ValueError(f"edge ({u}, {v}) not in graph")
+        u, v = self._edges.pop(copies.pop())
+        if not copies:
+            del self._copies[key]
+        _remove_last(self.adj_list[u], v)
+        if not self.directed:
+            _remove_last(self.adj_list[v], u)
+        # Удаление столбца матрицы инцидентности сдвигает все строки - проще перестроить
+        self._cache.pop("edges", None)
+        self._cache.pop("csr", None)
+        self._cache.pop("incidence_matrix", None)
+
+        if key not in self._copies:
+            # Кратных рёбер u - v больше нет
+            matrix = self._cache.get("adjacency_matrix")
+            if matrix is not None:
+                matrix[u][v] = 0
+                if not self.directed:
+                    matrix[v][u] = 0
+            bits = self._cache.get("adjacency_bits")
+            if bits is not None:
+                bits.clear(u, v)
+
+    # ---------- Представления ----------
+    # Матрицы кешируются: повторный запрос возвращает тот же объект, его нельзя изменять.
+
+    def adjacency_matrix(self) -> List[List[int]]:
+        """Возвращает матрицу смежности"""
+        if "adjacency_matrix" not in self._cache:
+            matrix = [[0] * self.vertices for _ in range(self.vertices)]
+            for u, v in self.edges:
+                matrix[u][v] = 1
+                if not self.directed:
+                    matrix[v][u] = 1
+            self._cache["adjacency_matrix"] = matrix
+        return self._cache["adjacency_matrix"]
+
+    def adjacency_bits(self) -> 'BitAdjacencyMatrix':
+        """Возвращает битовую матрицу смежности (один бит на клетку)"""
+        if "adjacency_bits" not in self._cache:
+            self._cache["adjacency_bits"] = BitAdjacencyMatrix.from_edges(self.vertices, self.edges, self.directed)
+        return self._cache["adjacency_bits"]
 
     def incidence_matrix(self) -> List[List[int]]:
         """Возвращает матрицу инцидентности"""
-        num_edges = len(self.edges)
-        matrix = [[0] * num_edges for _ in range(self.vertices)]
-        for i, (u, v) in enumerate(self.edges):
-            matrix[u][i] = 1
-            if not self.directed:
-                matrix[v][i] = 1
-            else:
-                matrix[v][i] = -1
-        return matrix
+        if "incidence_matrix" not in self._cache:
+            num_edges = len(self.edges)
+            matrix = [[0] * num_edges for _ in range(self.vertices)]
+            for i, (u, v) in enumerate(self.edges):
+                matrix[u][i] = 1
+                if not self.directed:
+                    matrix[v][i] = 1
+                else:
+                    matrix[v][i] = -1
+            self._cache["incidence_matrix"] = matrix
+        return self._cache["incidence_matrix"]
 
     def adjacency_list(self) -> Dict[int, List[int]]:
         """Возвращает список смежности"""
-        return dict(self.adj_list)
+        return {u: neighbors for u, neighbors in self.adj_list.items() if neighbors}
 
     def edge_list(self) -> List[Tuple[int, int]]:
         """Возвращает список всех рёбер"""
         return self.edges
 
+    def to_csr(self) -> 'CSRGraph':
+        """Возвращает представление графа в формате CSR"""
+        if "csr" not in self._cache:
+            self._cache["csr"] = CSRGraph.from_edges(self.vertices, self.edges, directed=self.directed)
+        return self._cache["csr"]
+
+
+def _remove_last(items: list, value: int):
+    """Удаляет последнее вхождение value из списка"""
+    for i in range(len(items) - 1, -1, -1):
+        if items[i] == value:
+            del items[i]
+            return
+
+
+# ---------- Граф в формате CSR ----------
+
+def _stable_order(keys: np.ndarray, vertices: int) -> np.ndarray:
+    """
+    Устойчивая перестановка, сортирующая номера вершин keys: LSD по 16-битным
+    разрядам (stable argsort numpy для uint16 выполняется сортировкой подсчётом)
+    """
+    order = np.argsort((keys & 0xFFFF).astype(np.uint16), kind="stable")
+    shift = 16
+    while vertices > (1 << shift):
+        digits = ((keys[order] >> shift) & 0xFFFF).astype(np.uint16)
+        order = order[np.argsort(digits, kind="stable")]
+        shift += 16
+    return order
+
+
+class CSRGraph:
+    """
+    Граф в сжатом строчном формате (CSR): соседи вершины v - это
+    indices[indptr[v]:indptr[v + 1]], edge_ids хранит номер ребра для каждой записи.
+    Порядок соседей совпадает с порядком в Graph.adj_list.
+    """
+
+    def __init__(self, vertices: int, edges: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 edge_ids: np.ndarray, directed: bool = False):
+        self.vertices = vertices
+        self.edges = edges  # массив E x 2
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+        self.directed = directed
+
+    @classmethod
+    def from_edges(cls, vertices: int, edges, directed: bool = False) -> 'CSRGraph':
+        """Строит CSR из списка или массива рёбер за O(V + E)"""
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edge_ids = np.arange(len(edges), dtype=np.int64)
+        if directed:
+            src, dst = edges[:, 0], edges[:, 1]
+        else:
+            # Прямые и обратные записи чередуются, как при заполнении adj_list
+            src = edges.ravel()
+            dst = edges[:, ::-1].ravel()
+            edge_ids = np.repeat(edge_ids, 2)
+
+        indptr = np.zeros(vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=vertices), out=indptr[1:])
+        order = _stable_order(src, vertices)
+        return cls(vertices, edges, indptr, dst[order], edge_ids[order], directed)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        return cls.from_edges(graph.vertices, graph.edges, directed=graph.directed)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edges)
+
+    def neighbors(self, v: int) -> np.ndarray:
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def to_graph(self) -> Graph:
+        return Graph(self.vertices, [tuple(edge) for edge in self.edges.tolist()], directed=self.directed)
+
+    def adjacency_list(self) -> Dict[int, List[int]]:
+        """Список смежности в формате Graph.adjacency_list (только вершины с соседями)"""
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        return {v: indices[indptr[v]:indptr[v + 1]]
+                for v in range(self.vertices) if indptr[v] != indptr[v + 1]}
+
+    def adjacency_matrix(self) -> List[List[int]]:
+        """Плотная матрица смежности, как Graph.adjacency_matrix"""
+        matrix = np.zeros((self.vertices, self.vertices), dtype=np.int8)
+        rows = np.repeat(np.arange(self.vertices), self.degrees())
+        matrix[rows, self.indices] = 1
+        return matrix.tolist()
+
+    def incidence_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Разреженная матрица инцидентности в формате CSR: (indptr, edge_ids, signs).
+        Для вершины v - рёбра edge_ids[indptr[v]:indptr[v + 1]] с коэффициентами
+        signs (1 - начало или неориентированное ребро, -1 - конец ориентированного).
+        """
+        num_edges = self.num_edges
+        rows = self.edges.T.ravel()
+        columns = np.tile(np.arange(num_edges, dtype=np.int64), 2)
+        signs = np.ones(2 * num_edges, dtype=np.int8)
+        if self.directed:
+            signs[num_edges:] = -1
+
+        indptr = np.zeros(self.vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.vertices), out=indptr[1:])
+        order = _stable_order(rows, self.vertices)
+        return indptr, columns[order], signs[order]
+
+    def incidence_matrix(self) -> List[List[int]]:
+        """Плотная матрица инцидентности, как Graph.incidence_matrix"""
+        indptr, edge_ids, signs = self.incidence_csr()
+        matrix = np.zeros((self.vertices, self.num_edges), dtype=np.int8)
+        rows = np.repeat(np.arange(self.vertices), np.diff(indptr))
+        matrix[rows, edge_ids] = signs
+        return matrix.tolist()
+
+
+# ---------- Битовая матрица смежности ----------
+
+_BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+# Сколько байт можно отдать под временные массивы операций над битовыми строками
+BIT_BUDGET = 1 << 26
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Число единичных битов в каждом слове uint64 (np.bitwise_count есть с numpy 2.0)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    words = np.ascontiguousarray(words)
+    return _BYTE_BITS[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+
+class BitAdjacencyMatrix:
+    """
+    Матрица смежности по одному биту на клетку: строка v - массив из ceil(V / 64)
+    слов uint64, бит w строки v установлен, если есть ребро v -> w. Занимает в 64 раза
+    меньше памяти, чем матрица байтов, а пересечение множеств соседей - это
+    побитовое И двух строк за O(V / 64).
+    """
+
+    def __init__(self, vertices: int, rows: np.ndarray, directed: bool = False):
+        self.vertices = vertices
+        self.rows = rows  # массив V x words, uint64
+        self.directed = directed
+
+    @classmethod
+    def from_edges(cls, vertices: int, edges, directed: bool = False) -> 'BitAdjacencyMatrix':
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        rows = np.zeros((vertices, (vertices + 63) // 64), dtype=np.uint64)
+        u, v = edges[:, 0], edges[:, 1]
+        if not directed:
+            u, v = np.concatenate((u, v)), np.concatenate((v, u))
+        np.bitwise_or.at(rows, (u, v >> 6), np.left_shift(np.uint64(1), (v & 63).astype(np.uint64)))
+        return cls(vertices, rows, directed)
+
+    @classmethod
+    def from_graph(cls, graph) -> 'BitAdjacencyMatrix':
+        return cls.from_edges(graph.vertices, graph.edges, directed=graph.directed)
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+    def _bit(self, v: int) -> np.uint64:
+        return np.uint64(1) << np.uint64(v & 63)
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return bool(self.rows[u, v >> 6] & self._bit(v))
+
+    def set(self, u: int, v: int):
+        self.rows[u, v >> 6] |= self._bit(v)
+        if not self.directed:
+            self.rows[v, u >> 6] |= self._bit(u)
+
+    def clear(self, u: int, v: int):
+        self.rows[u, v >> 6] &= ~self._bit(v)
+        if not self.directed:
+            self.rows[v, u >> 6] &= ~self._bit(u)
+
+    def _members(self, row: np.ndarray) -> np.ndarray:
+        """Номера установленных битов строки"""
+        bits = np.unpackbits(row.astype("<u8").view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:self.vertices])
+
+    def neighbors(self, v: int) -> np.ndarray:
+        return self._members(self.rows[v])
+
+    def degrees(self) -> np.ndarray:
+        return _popcount(self.rows).sum(axis=1, dtype=np.int64)
+
+    def common_neighbors(self, u: int, v: int) -> np.ndarray:
+        """Общие соседи u и v (пересечение строк)"""
+        return self._members(self.rows[u] & self.rows[v])
+
+    def count_common_neighbors(self, u: int, v: int) -> int:
+        return int(_popcount(self.rows[u] & self.rows[v]).sum())
+
+    def count_triangles(self, budget: int = BIT_BUDGET) -> int:
+        """
+        Число треугольников неориентированного графа: для каждого ребра u < v
+        считается число общих соседей, каждый треугольник учитывается трижды.
+        Строки распаковываются блоками, рёбра обрабатываются пачками; размеры
+        блоков подобраны так, чтобы временные массивы занимали около budget байт.
+        """
+        if self.directed:
+            raise ValueError("count_triangles: graph must be undirected")
+        # Петля делает вершину "соседом самой себя" - такие совпадения вычитаются
+        loops = np.array([self.has_edge(v, v) for v in range(self.vertices)], dtype=np.int64)
+        words = max(1, self.rows.shape[1])
+        block = max(1, budget // (words * 64))  # распакованная строка - байт на вершину
+        batch = max(1, budget // (words * 8 * 3))  # rows[pu], rows[pv] и их И
+        total = 0
+        for first in range(0, self.vertices, block):
+            bits = np.unpackbits(self.rows[first:first + block].astype("<u8").view(np.uint8),
+                                 axis=1, bitorder="little")[:, :self.vertices]
+            u, v = np.nonzero(bits)
+            u += first
+            keep = u < v
+            u, v = u[keep], v[keep]
+            for start in range(0, len(u), batch):
+                pu, pv = u[start:start + batch], v[start:start + batch]
+                common = _popcount(self.rows[pu] & self.rows[pv]).sum(axis=1, dtype=np.int64)
+                total += int((common - loops[pu] - loops[pv]).sum())
+        return total // 3
+
+    def expand(self, frontier: np.ndarray, visited: np.ndarray) -> np.ndarray:
+        """
+        Шаг BFS: битовое множество вершин, смежных с frontier и ещё не посещённых.
+        Строки фронта объединяются блоками, чтобы не копировать их все сразу.
+        """
+        members = self._members(frontier)
+        block = max(1, BIT_BUDGET // max(1, self.rows.shape[1] * 8))
+        result = np.zeros_like(frontier)
+        for first in range(0, len(members), block):
+            result |= np.bitwise_or.reduce(self.rows[members[first:first + block]], axis=0)
+        return result & ~visited
+
+    def bfs_distances(self, source: int) -> np.ndarray:
+        """Расстояния от source до всех вершин (-1 - недостижимо) с фронтом в виде битовой строки"""
+        distance = np.full(self.vertices, -1, dtype=np.int64)
+        frontier = np.zeros(self.rows.shape[1], dtype=np.uint64)
+        frontier[source >> 6] = self._bit(source)
+        visited = frontier.copy()
+        level = 0
+        while frontier.any():
+            distance[self._members(frontier)] = level
+            frontier = self.expand(frontier, visited)
+            visited |= frontier
+            level += 1
+        return distance
+
+    def to_dense(self) -> np.ndarray:
+        """Плотная матрица 0/1 (uint8)"""
+        bits = np.unpackbits(self.rows.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :self.vertices]
+
 
 # ---------- Генератор графов ----------
+def _edge_count(vertices: int, directed: bool) -> int:
+    """Число возможных рёбер без петель"""
+    return vertices * (vertices - 1) if directed else vertices * (vertices - 1) // 2
+
+
+def _index_to_edges(index: np.ndarray, vertices: int, directed: bool) -> np.ndarray:
+    """
+    Номера рёбер 0..M-1 -> пары (u, v) без петель: для ориентированного графа -
+    построчно по матрице без диагонали, для неориентированного - по верхнему треугольнику.
+    """
+    if directed:
+        u = index // (vertices - 1)
+        v = index % (vertices - 1)
+        v += v >= u
+        return np.stack((u, v), axis=1)
+
+    # Строка u начинается с номера u * (2V - u - 1) / 2; u находится из квадратного уравнения
+    b = 2 * vertices - 1
+    u = ((b - np.sqrt(b * b - 8.0 * index)) // 2).astype(np.int64)
+    offset = lambda row: row * (b - row) // 2
+    u -= offset(u) > index
+    u += offset(u + 1) <= index
+    v = index - offset(u) + u + 1
+    return np.stack((u, v), axis=1)
+
+
+def _sample_indices(population: int, count: int) -> np.ndarray:
+    """count различных номеров из range(population) в случайном порядке, без отбраковки по одному"""
+    if population <= 4 * count or population <= 10 ** 6:
+        return np.random.choice(population, count, replace=False)
+    # Разреженный случай: выборка с запасом, дубликаты убираются после одной сортировки
+    sample = np.empty(0, dtype=np.int64)
+    while len(sample) < count:
+        extra = np.random.randint(0, population, int((count - len(sample)) * 1.1) + 16, dtype=np.int64)
+        sample = np.sort(np.concatenate((sample, extra)))
+        sample = sample[np.concatenate(([True], sample[1:] != sample[:-1]))]
+    return np.random.permutation(sample)[:count]
+
+
+def _cap_degrees(edges: np.ndarray, degree: np.ndarray, max_degree: int) -> np.ndarray:
+    """
+    Оставляет рёбра (в порядке следования), пока степени обоих концов меньше max_degree.
+    Отброшенные рёбра тоже занимают место в очереди вершины, поэтому отбор консервативен.
+    """
+    endpoints = edges.ravel()
+    order = _stable_order(endpoints, len(degree))
+    counts = np.bincount(endpoints, minlength=len(degree))
+    first = np.cumsum(counts) - counts
+    rank = np.empty_like(endpoints)
+    rank[order] = np.arange(len(endpoints)) - first[endpoints[order]]
+    fits = (degree[endpoints] + rank < max_degree).reshape(-1, 2)
+    return edges[fits.all(axis=1)]
+
+
 class RandomGraphGenerator:
     def __init__(self,
                  min_vertices: int,
                  max_vertices: int,
                  min_edges: int,
                  max_edges: int,
-                 max_edges_per_vertex: int,
+                 max_edges_per_vertex: Optional[int],
                  directed: bool):
         self.min_vertices = min_vertices
         self.max_vertices = max_vertices
@@ -68,102 +517,379 @@ class RandomGraphGenerator:
 
     def generate(self) -> Graph:
         """Генерация случайного графа"""
+        csr = self.generate_csr()
+        graph = Graph(csr.vertices, list(map(tuple, csr.edges.tolist())), directed=self.directed)
+        # CSR уже построен из тех же рёбер - второй раз его не строим
+        graph._cache["csr"] = csr
+        return graph
+
+    def _max_edges(self, vertices: int) -> int:
+        limit = _edge_count(vertices, self.directed)
+        if self.max_edges_per_vertex is not None:
+            limit = min(limit, vertices * self.max_edges_per_vertex // 2)
+        return limit
+
+    def generate_edges(self, vertices: int, num_edges: int) -> np.ndarray:
+        """
+        num_edges различных рёбер (массив E x 2): номера рёбер выбираются без возвращения
+        сразу пачкой, ограничение max_edges_per_vertex применяется векторно.
+        Если ограничение не даёт набрать num_edges, возвращается сколько удалось.
+        """
+        population = _edge_count(vertices, self.directed)
+        if self.max_edges_per_vertex is None:
+            return _index_to_edges(_sample_indices(population, num_edges), vertices, self.directed)
+
+        degree = np.zeros(vertices, dtype=np.int64)
+        chosen = np.empty(0, dtype=np.int64)
+        result = []
+        while len(chosen) < num_edges:
+            need = num_edges - len(chosen)
+            candidates = _sample_indices(population, min(population, need + need // 2 + 16))
+            candidates = candidates[~np.isin(candidates, chosen)]
+            edges = _cap_degrees(_index_to_edges(candidates, vertices, self.directed),
+                                 degree, self.max_edges_per_vertex)[:need]
+            if len(edges) == 0:
+                break  # Степени почти исчерпаны
+            chosen = np.concatenate((chosen, self._edges_to_index(edges, vertices)))
+            degree += np.bincount(edges.ravel(), minlength=vertices)
+            result.append(edges)
+        return np.concatenate(result) if result else np.empty((0, 2), dtype=np.int64)
+
+    def _edges_to_index(self, edges: np.ndarray, vertices: int) -> np.ndarray:
+        u, v = edges[:, 0], edges[:, 1]
+        if self.directed:
+            return u * (vertices - 1) + v - (v > u)
+        return u * (2 * vertices - u - 1) // 2 + v - u - 1
+
+    def generate_csr(self) -> CSRGraph:
+        """Случайный граф сразу в формате CSR, без промежуточных списков Python"""
         vertices = random.randint(self.min_vertices, self.max_vertices)
-        max_possible_edges = (vertices * (vertices - 1)) if self.directed else (vertices * (vertices - 1)) // 2
-        num_edges = random.randint(self.min_edges, min(max_possible_edges, self.max_edges))
+        num_edges = random.randint(min(self.min_edges, self._max_edges(vertices)),
+                                   min(self._max_edges(vertices), self.max_edges))
+        edges = self.generate_edges(vertices, num_edges)
+        return CSRGraph.from_edges(vertices, edges, directed=self.directed)
 
-        edges = set()
-        while len(edges) < num_edges:
-            u = random.randint(0, vertices - 1)
-            v = random.randint(0, vertices - 1)
-            if u == v:
-                continue  # исключение петель
-            if (u, v) not in edges and (not self.directed and (v, u) not in edges):
-                edges.add((u, v))
+    def generate_gnp(self, p: float) -> CSRGraph:
+        """
+        Граф Эрдёша-Реньи G(n, p): каждое ребро присутствует независимо с вероятностью p.
+        Вместо M испытаний номера рёбер получаются пропусками с геометрическим
+        распределением, т.е. за O(V + E). Ограничение степени отбрасывает лишние рёбра.
+        """
+        vertices = random.randint(self.min_vertices, self.max_vertices)
+        population = _edge_count(vertices, self.directed)
+        if p <= 0 or population == 0:
+            index = np.empty(0, dtype=np.int64)
+        elif p >= 1:
+            index = np.arange(population, dtype=np.int64)
+        else:
+            parts = []
+            position = -1
+            while position < population:
+                batch = int(population * p * 1.05) + 64
+                steps = np.cumsum(np.random.geometric(p, batch)) + position
+                parts.append(steps[steps < population])
+                position = int(steps[-1])
+            index = np.concatenate(parts)
 
-        return Graph(vertices, list(edges), directed=self.directed)
+        edges = _index_to_edges(index, vertices, self.directed)
+        if self.max_edges_per_vertex is not None:
+            edges = np.random.permutation(edges)
+            edges = _cap_degrees(edges, np.zeros(vertices, dtype=np.int64), self.max_edges_per_vertex)
+        return CSRGraph.from_edges(vertices, edges, directed=self.directed)
 
 
 # ---------- Поиск кратчайшего пути ----------
 
+def _neighbors(graph):
+    """
+    Функция "вершина -> соседи", читающая смежность напрямую
+    (без копирования adjacency_list на каждом шаге)
+    """
+    if isinstance(graph, CSRGraph):
+        indptr = graph.indptr.tolist()
+        indices = graph.indices.tolist()
+        return lambda node: indices[indptr[node]:indptr[node + 1]]
+    adj_list = graph.adj_list
+    empty = ()
+    return lambda node: adj_list.get(node, empty)
+
+
+def _reconstruct_path(parent: List[int], start: int, end: int) -> List[int]:
+    """Восстанавливает путь start -> end по массиву родителей"""
+    path = [end]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
 def bfs_shortest_path(graph: Graph, start: int, end: int) -> Optional[List[int]]:
-    """Поиск кратчайшего пути с использованием BFS"""
-    queue = deque([[start]])
-    visited = set()
+    """Поиск кратчайшего пути с использованием BFS (массив родителей вместо копий путей)"""
+    neighbors = _neighbors(graph)
+    parent = [-1] * graph.vertices
+    parent[start] = start
+    queue = deque([start])
 
     while queue:
-        path = queue.popleft()
-        node = path[-1]
+        node = queue.popleft()
         if node == end:
-            return path
-        if node not in visited:
-            visited.add(node)
-            for neighbor in graph.adjacency_list().get(node, []):
-                if neighbor not in visited:
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append(new_path)
+            return _reconstruct_path(parent, start, end)
+        for neighbor in neighbors(node):
+            if parent[neighbor] == -1:
+                parent[neighbor] = node
+                queue.append(neighbor)
     return None
 
 
 def dfs_shortest_path(graph: Graph, start: int, end: int) -> Optional[List[int]]:
-    """Поиск пути с использованием DFS"""
-    stack = [[start]]
-    visited = set()
+    """Поиск пути с использованием DFS (явный стек пар вершина-родитель)"""
+    neighbors = _neighbors(graph)
+    parent = [-1] * graph.vertices
+    visited = [False] * graph.vertices
+    stack = [(start, start)]
 
     while stack:
-        path = stack.pop()
-        node = path[-1]
+        node, came_from = stack.pop()
+        if visited[node]:
+            continue
+        visited[node] = True
+        parent[node] = came_from
         if node == end:
-            return path
-        if node not in visited:
-            visited.add(node)
-            for neighbor in graph.adjacency_list().get(node, []):
-                if neighbor not in visited:
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    stack.append(new_path)
+            return _reconstruct_path(parent, start, end)
+        for neighbor in neighbors(node):
+            if not visited[neighbor]:
+                stack.append((neighbor, node))
     return None
 
 
+def bidirectional_bfs_shortest_path(graph: Graph, start: int, end: int) -> Optional[List[int]]:
+    """
+    Кратчайший путь двунаправленным BFS: поиск ведётся одновременно от start и от end,
+    каждый раз расширяется меньший фронт. Для ориентированных графов - обычный BFS.
+    """
+    if graph.directed:
+        return bfs_shortest_path(graph, start, end)
+    if start == end:
+        return [start]
+
+    neighbors = _neighbors(graph)
+    parents = ([-1] * graph.vertices, [-1] * graph.vertices)
+    distances = ([-1] * graph.vertices, [-1] * graph.vertices)
+    frontiers = ([start], [end])
+    for side, root in enumerate((start, end)):
+        parents[side][root] = root
+        distances[side][root] = 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, distance = parents[side], distances[side]
+        other_distance = distances[1 - side]
+        best = None
+        next_frontier = []
+
+        # Уровень расширяется целиком, чтобы выбрать кратчайшую из встреч
+        for node in frontiers[side]:
+            for neighbor in neighbors(node):
+                if other_distance[neighbor] != -1:
+                    length = distance[node] + 1 + other_distance[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, node, neighbor)
+                if distance[neighbor] == -1:
+                    distance[neighbor] = distance[node] + 1
+                    parent[neighbor] = node
+                    next_frontier.append(neighbor)
+
+        if best is not None:
+            _, node, neighbor = best
+            if side == 1:
+                node, neighbor = neighbor, node
+            return _reconstruct_path(parents[0], start, node) + \
+                _reconstruct_path(parents[1], end, neighbor)[::-1]
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None
+
+
+# ---------- Пакетные запросы BFS ----------
+
+def _as_csr(graph) -> CSRGraph:
+    return graph if isinstance(graph, CSRGraph) else graph.to_csr()
+
+
+def _expand(csr: CSRGraph, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Все рёбра из вершин фронта одним векторным шагом: (номер вершины во фронте, сосед)"""
+    starts = csr.indptr[frontier]
+    lengths = csr.indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    owners = np.repeat(np.arange(len(frontier)), lengths)
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owners, csr.indices[starts[owners] + offsets]
+
+
+def multi_source_bfs(graph, sources) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BFS сразу из нескольких источников, фронт обрабатывается целиком numpy-операциями.
+    Возвращает (расстояние до ближайшего источника, этот источник); -1 - недостижимо.
+    """
+    csr = _as_csr(graph)
+    sources = np.unique(np.asarray(sources, dtype=np.int64))
+    distance = np.full(csr.vertices, -1, dtype=np.int64)
+    nearest = np.full(csr.vertices, -1, dtype=np.int64)
+    distance[sources] = 0
+    nearest[sources] = sources
+
+    frontier = sources
+    level = 0
+    while frontier.size:
+        level += 1
+        owners, neighbors = _expand(csr, frontier)
+        fresh = distance[neighbors] == -1
+        neighbors, owners = neighbors[fresh], owners[fresh]
+        # Первая запись для каждой новой вершины определяет её источник
+        neighbors, first = np.unique(neighbors, return_index=True)
+        distance[neighbors] = level
+        nearest[neighbors] = nearest[frontier[owners[first]]]
+        frontier = neighbors
+    return distance, nearest
+
+
+def bfs_distances(graph, source: int) -> np.ndarray:
+    """Расстояния (в рёбрах) от source до всех вершин, -1 - недостижимо"""
+    return multi_source_bfs(graph, [source])[0]
+
+
+BITSET_WIDTH = 64
+
+
+def bitset_bfs(graph, sources) -> np.ndarray:
+    """
+    До 64 независимых BFS за один проход: у каждой вершины маска uint64,
+    бит i которой означает "достигнута из sources[i]". Возвращает матрицу
+    расстояний len(sources) x V (-1 - недостижимо).
+    """
+    csr = _as_csr(graph)
+    sources = np.asarray(sources, dtype=np.int64)
+    if len(sources) > BITSET_WIDTH:
+        raise ValueError(f"bitset_bfs: at most {BITSET_WIDTH} sources per pass")
+
+    bits = np.left_shift(np.uint64(1), np.arange(len(sources), dtype=np.uint64))
+    visited = np.zeros(csr.vertices, dtype=np.uint64)
+    np.bitwise_or.at(visited, sources, bits)
+    frontier_mask = visited.copy()
+    distance = np.full((len(sources), csr.vertices), -1, dtype=np.int64)
+    distance[np.arange(len(sources)), sources] = 0
+
+    frontier = np.flatnonzero(frontier_mask)
+    level = 0
+    while frontier.size:
+        level += 1
+        owners, neighbors = _expand(csr, frontier)
+        reached = np.zeros(csr.vertices, dtype=np.uint64)
+        np.bitwise_or.at(reached, neighbors, frontier_mask[frontier[owners]])
+        new = reached & ~visited
+        visited |= new
+
+        frontier = np.flatnonzero(new)
+        frontier_mask = new
+        for i, bit in enumerate(bits):
+            distance[i, frontier[(new[frontier] & bit) != 0]] = level
+    return distance
+
+
+def all_pairs_distances(graph) -> np.ndarray:
+    """Матрица расстояний V x V невзвешенного графа: bitset BFS по 64 источника за проход"""
+    csr = _as_csr(graph)
+    result = np.empty((csr.vertices, csr.vertices), dtype=np.int64)
+    for first in range(0, csr.vertices, BITSET_WIDTH):
+        sources = np.arange(first, min(first + BITSET_WIDTH, csr.vertices))
+        result[sources] = bitset_bfs(csr, sources)
+    return result
+
+
+def batch_shortest_path_lengths(graph, pairs: List[Tuple[int, int]]) -> List[int]:
+    """
+    Длины кратчайших путей для многих пар (start, end) сразу: различные start
+    обрабатываются пачками по 64 в bitset_bfs. -1 - путь не существует.
+    Ответы пачки снимаются сразу, поэтому в памяти не больше 64 строк расстояний.
+    """
+    csr = _as_csr(graph)
+    queries = defaultdict(list)  # start -> номера запросов
+    for k, (start, _) in enumerate(pairs):
+        queries[start].append(k)
+    starts = sorted(queries)
+    lengths = [0] * len(pairs)
+    for first in range(0, len(starts), BITSET_WIDTH):
+        batch = starts[first:first + BITSET_WIDTH]
+        distances = bitset_bfs(csr, batch)
+        for i, start in enumerate(batch):
+            for k in queries[start]:
+                lengths[k] = int(distances[i, pairs[k][1]])
+    return lengths
+
+
 # ---------- Тесты производительности ----------
 
-def test_performance():
-    generator = RandomGraphGenerator(
-        min_vertices=10,
-        max_vertices=50,
-        min_edges=20,
-        max_edges=100,
-        max_edges_per_vertex=10,
-        directed=False
-    )
-
-    vertices_range = range(10, 105, 10)
+def test_performance(cache_dir: Optional[str] = None):
+    """
+    Время поиска путей на случайных графах. Если задан cache_dir, графы
+    сохраняются туда при первом запуске и загружаются при следующих,
+    чтобы сравнения шли на одних и тех же входных данных.
+    """
+    # Импорт здесь: graph_io сам импортирует этот модуль
+    import graph_io
+
+    vertices_range = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    queries = 10
     bfs_times = []
     dfs_times = []
+    bidirectional_times = []
+    batch_times = []
 
     for num_vertices in vertices_range:
-        graph = generator.generate()
-        start, end = random.randint(0, num_vertices - 1), random.randint(0, num_vertices - 1)
-        while start == end:  # Исключаем одинаковые вершины
-            end = random.randint(0, num_vertices - 1)
+        generator = RandomGraphGenerator(
+            min_vertices=num_vertices,
+            max_vertices=num_vertices,
+            min_edges=3 * num_vertices,
+            max_edges=3 * num_vertices,
+            max_edges_per_vertex=10,
+            directed=False
+        )
+        cache_path = os.path.join(cache_dir, f"graph_{num_vertices}.bin") if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            graph = graph_io.load_graph(cache_path)
+        else:
+            graph = generator.generate()
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                graph_io.save_graph(cache_path, graph)
 
-        # Замер времени для BFS
-        start_time = time.time()
-        bfs_shortest_path(graph, start, end)
-        bfs_time = time.time() - start_time
-        bfs_times.append(bfs_time)
+        pairs = []
+        for _ in range(queries):
+            start, end = random.randint(0, num_vertices - 1), random.randint(0, num_vertices - 1)
+            while start == end:  # Исключаем одинаковые вершины
+                end = random.randint(0, num_vertices - 1)
+            pairs.append((start, end))
 
-        # Замер времени для DFS
+        for search, times in ((bfs_shortest_path, bfs_times),
+                              (dfs_shortest_path, dfs_times),
+                              (bidirectional_bfs_shortest_path, bidirectional_times)):
+            start_time = time.time()
+            for start, end in pairs:
+                search(graph, start, end)
+            times.append((time.time() - start_time) / queries)
+
+        # Те же запросы одним пакетом (время в пересчёте на запрос)
         start_time = time.time()
-        dfs_shortest_path(graph, start, end)
-        dfs_time = time.time() - start_time
-        dfs_times.append(dfs_time)
+        batch_shortest_path_lengths(graph, pairs)
+        batch_times.append((time.time() - start_time) / queries)
 
     # Построение графика
     plt.figure(figsize=(10, 6))
     plt.plot(vertices_range, bfs_times, label="BFS", marker="o")
     plt.plot(vertices_range, dfs_times, label="DFS", marker="o")
+    plt.plot(vertices_range, bidirectional_times, label="Двунаправленный BFS", marker="o")
+    plt.plot(vertices_range, batch_times, label="Пакетный bitset BFS", marker="o")
+    plt.xscale("log")
+    plt.yscale("log")
     plt.xlabel("Количество вершин")
     plt.ylabel("Время выполнения (секунды)")
     plt.title("Производительность BFS и DFS на случайных графах")
@@ -172,5 +898,51 @@ def test_performance():
     plt.show()
 
 
+def test_generation():
+    """Время генерации графов с 10^5..10^7 рёбрами сразу в CSR"""
+    for num_edges in [10 ** 5, 10 ** 6, 10 ** 7]:
+        num_vertices = num_edges // 3
+        generator = RandomGraphGenerator(
+            min_vertices=num_vertices,
+            max_vertices=num_vertices,
+            min_edges=num_edges,
+            max_edges=num_edges,
+            max_edges_per_vertex=10,
+            directed=False
+        )
+        start_time = time.time()
+        graph = generator.generate_csr()
+        uniform_time = time.time() - start_time
+
+        start_time = time.time()
+        gnp = generator.generate_gnp(2 * num_edges / (num_vertices * (num_vertices - 1)))
+        gnp_time = time.time() - start_time
+
+        print(f"Рёбер: {graph.num_edges} Время: {uniform_time:.3f} | "
+              f"G(n, p) рёбер: {gnp.num_edges} Время: {gnp_time:.3f}")
+
+
+def test_incremental(num_vertices: int = 2000, operations: int = 500):
+    """Чередование добавления/удаления рёбер и запросов матриц: кеш с дополнением против перестроения"""
+    for cached in (True, False):
+        graph = RandomGraphGenerator(num_vertices, num_vertices, 3 * num_vertices, 3 * num_vertices,
+                                     None, directed=False).generate()
+        start_time = time.time()
+        for i in range(operations):
+            u, v = random.sample(range(num_vertices), 2)
+            graph.add_edge(u, v)
+            if i % 2:
+                graph.remove_edge(u, v)
+            if not cached:
+                graph._cache.clear()
+            graph.adjacency_matrix()
+            graph.to_csr()
+        execution_time = time.time() - start_time
+        print(f"{'С кешем' if cached else 'Перестроение'}: {execution_time / operations:.6f} сек на операцию")
+
+
 # Запуск тестов
-test_performance()
+if __name__ == "__main__":
+    test_incremental()
+    test_generation()
+    test_performance(cache_dir="graphs")
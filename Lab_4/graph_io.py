@@ -0,0 +1,178 @@
+import os
+import shutil
+import sys
+
+import numpy as np
+
+from graph import Graph, CSRGraph
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from log_parser import iter_chunks
+
+
+# ---------- Двоичный формат графа ----------
+# Заголовок HEADER_SIZE байт, затем массив рёбер int64 (E x 2) и, для взвешенного
+# графа, массив весов (E). Все числа little-endian, поэтому файл открывается
+# numpy.memmap без копирования и без разбора.
+
+MAGIC = b"GRAPHBIN"
+VERSION = 1
+HEADER_SIZE = 64
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("directed", "u1"),
+    ("weighted", "u1"),
+    ("weight_type", "S2"),  # "i8" или "f8"
+    ("vertices", "<i8"),
+    ("edges", "<i8"),
+])
+
+EDGE_DTYPE = np.dtype("<i8")
+
+
+class GraphFile:
+    """Граф, открытый из файла: edges и weights - memmap-массивы (или None для весов)"""
+
+    def __init__(self, vertices: int, edges: np.ndarray, weights, directed: bool):
+        self.vertices = vertices
+        self.edges = edges
+        self.weights = weights
+        self.directed = directed
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edges)
+
+
+def _header(vertices, num_edges, weight_type, directed) -> bytes:
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["directed"] = directed
+    header["weighted"] = weight_type is not None
+    header["weight_type"] = weight_type or ""
+    header["vertices"] = vertices
+    header["edges"] = num_edges
+    return header.tobytes().ljust(HEADER_SIZE, b"\0")
+
+
+def _weight_dtype(weights: np.ndarray) -> np.dtype:
+    return np.dtype("<f8") if weights.dtype.kind == "f" else np.dtype("<i8")
+
+
+def write_graph(path, vertices: int, edges, weights=None, directed: bool = False):
+    """Записывает граф (массив рёбер E x 2 и, при наличии, веса) в двоичный файл"""
+    edges = np.asarray(edges, dtype=EDGE_DTYPE).reshape(-1, 2)
+    weight_type = None
+    if weights is not None:
+        weights = np.asarray(weights)
+        weights = weights.astype(_weight_dtype(weights))
+        weight_type = weights.dtype.str[1:]
+
+    with open(path, "wb") as file:
+        file.write(_header(vertices, len(edges), weight_type, directed))
+        edges.tofile(file)
+        if weights is not None:
+            weights.tofile(file)
+
+
+def open_graph(path, mode: str = "r") -> GraphFile:
+    """Открывает файл графа через numpy.memmap: данные читаются с диска по мере обращения"""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{path}: not a graph file")
+    if header["version"][0] != VERSION:
+        raise ValueError(f"{path}: unsupported graph file version {header['version'][0]}")
+
+    vertices = int(header["vertices"][0])
+    num_edges = int(header["edges"][0])
+    directed = bool(header["directed"][0])
+    # memmap не умеет отображать пустой участок
+    if num_edges == 0:
+        weights = np.empty(0, dtype="<" + header["weight_type"][0].decode()) if header["weighted"][0] else None
+        return GraphFile(vertices, np.empty((0, 2), dtype=EDGE_DTYPE), weights, directed)
+
+    edges = np.memmap(path, dtype=EDGE_DTYPE, mode=mode, offset=HEADER_SIZE, shape=(num_edges, 2))
+    weights = None
+    if header["weighted"][0]:
+        weights = np.memmap(path, dtype="<" + header["weight_type"][0].decode(), mode=mode,
+                            offset=HEADER_SIZE + edges.nbytes, shape=(num_edges,))
+    return GraphFile(vertices, edges, weights, directed)
+
+
+def save_graph(path, graph):
+    """Сохраняет Graph или CSRGraph"""
+    write_graph(path, graph.vertices, graph.edges, directed=graph.directed)
+
+
+def load_graph(path, csr: bool = False):
+    """Загружает граф из файла: Graph или, при csr=True, CSRGraph (без списков Python)"""
+    stored = open_graph(path)
+    if csr:
+        return CSRGraph.from_edges(stored.vertices, stored.edges, directed=stored.directed)
+    return Graph(stored.vertices, list(map(tuple, stored.edges.tolist())), directed=stored.directed)
+
+
+# ---------- Текстовый список рёбер ----------
+# Строка "u v" или "u v w", строки, начинающиеся с '#' или '%', пропускаются.
+
+def iter_edge_list(text_path, weighted: bool = False, chunk_size: int = 1 << 24):
+    """
+    Потоково разбирает текстовый список рёбер: пары (рёбра E x 2 int64, веса float64
+    или None) на каждый кусок. Номера вершин разбираются сразу как целые, без float.
+    """
+    columns = 3 if weighted else 2
+    for block in iter_chunks(text_path, chunk_size):
+        if "#" in block or "%" in block:
+            block = "\n".join(line for line in block.splitlines() if not line.lstrip().startswith(("#", "%")))
+        tokens = np.array(block.split()).reshape(-1, columns)
+        if len(tokens) == 0:
+            continue
+        edges = tokens[:, :2].astype(np.int64)
+        weights = tokens[:, 2].astype(np.float64) if weighted else None
+        yield edges, weights
+
+
+def import_edge_list(text_path, graph_path, weighted: bool = False, directed: bool = False,
+                     vertices=None, chunk_size: int = 1 << 24) -> GraphFile:
+    """
+    Переводит текстовый список рёбер в двоичный формат, не держа граф в памяти:
+    рёбра дописываются в файл кусками, веса (float64) - во временный файл, который
+    потом присоединяется в конец. Если все веса оказались целыми, они в конце
+    одним проходом переводятся в int64. vertices по умолчанию - наибольший номер вершины + 1.
+    """
+    weights_path = graph_path + ".weights"
+    num_edges = 0
+    max_vertex = -1
+    integral = True
+
+    try:
+        with open(graph_path, "wb") as file, open(weights_path, "wb") as weights_file:
+            file.write(_header(0, 0, None, directed))
+            for edges, weights in iter_edge_list(text_path, weighted, chunk_size):
+                edges.astype(EDGE_DTYPE).tofile(file)
+                num_edges += len(edges)
+                max_vertex = max(max_vertex, int(edges.max()))
+                if weighted:
+                    integral = integral and bool(np.all((weights == np.round(weights)) & (np.abs(weights) < 2.0 ** 63)))
+                    weights.astype("<f8").tofile(weights_file)
+
+        with open(graph_path, "r+b") as file:
+            file.seek(0, os.SEEK_END)
+            if weighted and integral:
+                buffer_items = max(1, chunk_size // 8)
+                for start in range(0, num_edges, buffer_items):
+                    chunk = np.fromfile(weights_path, dtype="<f8", count=buffer_items, offset=start * 8)
+                    chunk.astype("<i8").tofile(file)
+            elif weighted:
+                with open(weights_path, "rb") as weights_file:
+                    shutil.copyfileobj(weights_file, file)
+            file.seek(0)
+            weight_type = ("i8" if integral else "f8") if weighted else None
+            file.write(_header(max_vertex + 1 if vertices is None else vertices, num_edges, weight_type, directed))
+    finally:
+        if os.path.exists(weights_path):
+            os.remove(weights_path)
+    return open_graph(graph_path)
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+# ---------- Система непересекающихся множеств ----------
+class DisjointSet:
+    """
+    Система непересекающихся множеств на массивах numpy: parent - родитель
+    элемента (корень указывает сам на себя), size - размер множества корня.
+    Поиск итеративный с сокращением пути "через одного" (path halving),
+    объединение по размеру, число множеств хранится в components.
+    """
+
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int64)
+        self.size = np.ones(n, dtype=np.int64)
+        self.components = n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        """Корень множества x"""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return int(x)
+
+    def union(self, a: int, b: int) -> bool:
+        """Объединяет множества a и b. Возвращает False, если они уже совпадали."""
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def component_size(self, x: int) -> int:
+        return int(self.size[self.find(x)])
+
+    def union_many(self, first, second, stop_components: int = None) -> np.ndarray:
+        """
+        Объединяет пары (first[i], second[i]) по порядку. Возвращает маску пар,
+        которые соединили разные множества. Если задан stop_components, обработка
+        прекращается, как только множеств становится столько (остальные пары - False).
+        Цикл идёт по спискам Python, массивы numpy обновляются один раз в конце.
+        """
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        merged = np.zeros(len(first), dtype=bool)
+        if stop_components is not None and self.components <= stop_components:
+            return merged
+
+        parent = self.parent.tolist()
+        size = self.size.tolist()
+        components = self.components
+        accepted = []
+
+        for i, (a, b) in enumerate(zip(first.tolist(), second.tolist())):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+            components -= 1
+            accepted.append(i)
+            if components == stop_components:
+                break
+
+        self.parent = np.array(parent, dtype=np.int64)
+        self.size = np.array(size, dtype=np.int64)
+        self.components = components
+        merged[accepted] = True
+        return merged
+
+    def roots(self) -> np.ndarray:
+        """Корни всех элементов сразу: переход parent[parent] векторно, пока есть изменения"""
+        parent = self.parent
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        self.parent = parent
+        return parent.copy()
+
+    def labels(self) -> np.ndarray:
+        """Номера множеств 0, 1, ... в порядке первого появления при проходе по элементам"""
+        _, first, inverse = np.unique(self.roots(), return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(first))
+        return rank[inverse]
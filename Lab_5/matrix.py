@@ -1,6 +1,14 @@
+import os
 import random
+import sys
 import time
 import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_4"))
+from graph import BitAdjacencyMatrix
+from graph_io import open_graph, write_graph
+from disjoint_set import DisjointSet
 
 
 # ---------- Класс графа ----------
@@ -8,34 +16,129 @@ class WeightedGraph:
     def __init__(self, vertices: int):
         """Инициализация графа."""
         self.vertices = vertices
-        self.edges = []  # Список рёбер (u, v, вес)
-        self.adj_matrix = [[0] * vertices for _ in range(vertices)]  # Матрица смежности
+        self.edges = []  # Список рёбер (u, v, вес), каждое неориентированное ребро - один раз
+        self._adj_matrix = None  # Матрица весов строится при первом обращении
+
+    @property
+    def adj_matrix(self) -> np.ndarray:
+        """Матрица весов V x V (для больших графов не запрашивать - O(V^2) памяти)."""
+        if self._adj_matrix is None:
+            # Тип матрицы - тип весов (int64 или float64), 0 - нет ребра
+            weights = np.asarray([w for _, _, w in self.edges]) if self.edges else np.zeros(0, dtype=np.int64)
+            matrix = np.zeros((self.vertices, self.vertices), dtype=np.result_type(weights))
+            if self.edges:
+                ends = np.array([(u, v) for u, v, _ in self.edges], dtype=np.int64)
+                # Обе клетки ребра подряд: при повторном ребре побеждает последнее, как в add_edge
+                rows = ends[:, [0, 1]].ravel()
+                columns = ends[:, [1, 0]].ravel()
+                matrix[rows, columns] = np.repeat(weights, 2)
+            self._adj_matrix = matrix
+        return self._adj_matrix
 
     def add_edge(self, u: int, v: int, weight: int):
         """Добавление ребра в граф."""
         self.edges.append((u, v, weight))
-        self.edges.append((v, u, weight))  # Для неориентированного графа
-        self.adj_matrix[u][v] = weight
-        self.adj_matrix[v][u] = weight
-
-    def generate_random_graph(self, min_edges_per_vertex: int, weight_range: tuple = (1, 20)):
-        """Генерация случайного связного графа."""
-        # Шаг 1: Создаем связный граф (на случай, если вершины не связаны)
-        for u in range(self.vertices - 1):
-            weight = random.randint(*weight_range)
-            self.add_edge(u, u + 1, weight)
-
-        # Шаг 2: Добавляем дополнительные рёбра случайным образом
-        for u in range(self.vertices):
-            num_edges = random.randint(min_edges_per_vertex, self.vertices - 1)
-            connected = set(v for u_, v, _ in self.edges if u_ == u)  # Уже связные вершины
-
-            while len(connected) < num_edges:
-                v = random.randint(0, self.vertices - 1)
-                if u != v and v not in connected:  # Исключаем петли и повторяющиеся рёбра
-                    weight = random.randint(*weight_range)
-                    self.add_edge(u, v, weight)
-                    connected.add(v)
+        matrix = self._adj_matrix
+        if matrix is None:
+            return
+        if np.result_type(matrix.dtype, np.asarray(weight)) != matrix.dtype:
+            # Вес не помещается в тип матрицы (например, дробный) - перестроим при обращении
+            self._adj_matrix = None
+            return
+        matrix[u][v] = weight
+        matrix[v][u] = weight
+
+    def generate_random_graph(self, min_edges_per_vertex: int, weight_range: tuple = (1, 20),
+                              max_edges_per_vertex: int = None):
+        """
+        Генерация случайного связного графа.
+        Каждой вершине назначается степень от min_edges_per_vertex до
+        max_edges_per_vertex (по умолчанию V - 1), недостающие соседи выбираются
+        без повторных попыток среди ещё не смежных вершин, у которых степень меньше
+        max_edges_per_vertex. Итоговая степень не превышает max_edges_per_vertex
+        (кроме цепочки связности при max_edges_per_vertex < 2) и может оказаться
+        меньше назначенной, если свободных вершин не осталось.
+        """
+        vertices = self.vertices
+        upper = vertices - 1 if max_edges_per_vertex is None else min(max_edges_per_vertex, vertices - 1)
+        lower = min(min_edges_per_vertex, upper)
+        neighbors = [set() for _ in range(vertices)]  # Поддерживаются по мере добавления рёбер
+        for u, v, _ in self.edges:
+            neighbors[u].add(v)
+            neighbors[v].add(u)
+
+        # Шаг 1: Создаем связный граф (цепочка 0 - 1 - ... - V-1)
+        sources = [np.arange(vertices - 1)]
+        targets = [np.arange(1, vertices)]
+        for u in range(vertices - 1):
+            neighbors[u].add(u + 1)
+            neighbors[u + 1].add(u)
+
+        # Шаг 2: Добавляем дополнительные рёбра случайным образом.
+        # open_vertices - вершины со степенью меньше upper, position - их индексы в нём
+        open_vertices = [v for v in range(vertices) if len(neighbors[v]) < upper]
+        position = [-1] * vertices
+        for i, v in enumerate(open_vertices):
+            position[v] = i
+
+        def close(v):
+            """Убирает заполненную вершину из open_vertices (перестановкой с последней)"""
+            i = position[v]
+            last = open_vertices.pop()
+            if last != v:
+                open_vertices[i] = last
+                position[last] = i
+            position[v] = -1
+
+        degrees = np.random.randint(lower, upper + 1, vertices)
+        for u, degree in enumerate(degrees.tolist()):
+            need = degree - len(neighbors[u])
+            if need <= 0:
+                continue
+            # Среди выборки без повторов размера need + |соседи u| + 1 заведомо
+            # найдётся need подходящих вершин (если они вообще есть) - без повторных попыток
+            size = min(len(open_vertices), need + len(neighbors[u]) + 1)
+            sample = (open_vertices[i] for i in random.sample(range(len(open_vertices)), size))
+            picked = [v for v in sample if v != u and v not in neighbors[u]][:need]
+            if not picked:
+                continue
+
+            neighbors[u].update(picked)
+            for v in picked:
+                neighbors[v].add(u)
+                if len(neighbors[v]) >= upper:
+                    close(v)
+            if len(neighbors[u]) >= upper:
+                close(u)
+            sources.append(np.full(len(picked), u))
+            targets.append(np.array(picked, dtype=np.int64))
+
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+        weights = np.random.randint(weight_range[0], weight_range[1] + 1, len(sources))
+        self.edges.extend(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+        self._adj_matrix = None
+
+    def save(self, path: str):
+        """Сохранение графа в двоичный файл (формат Lab_4/graph_io.py), веса - i8 или f8."""
+        ends = np.array([(u, v) for u, v, _ in self.edges], dtype=np.int64).reshape(-1, 2)
+        weights = np.asarray([w for _, _, w in self.edges])
+        write_graph(path, self.vertices, ends, weights)
+
+    @classmethod
+    def load(cls, path: str) -> 'WeightedGraph':
+        """Загрузка графа, сохранённого методом save."""
+        stored = open_graph(path)
+        if stored.weights is None:
+            raise ValueError(f"{path}: graph file has no weights")
+        graph = cls(stored.vertices)
+        graph.edges = list(zip(stored.edges[:, 0].tolist(), stored.edges[:, 1].tolist(), stored.weights.tolist()))
+        return graph
+
+    def adjacency_bits(self) -> BitAdjacencyMatrix:
+        """Битовая матрица смежности (Lab_4/graph.py) - есть ли ребро, без весов."""
+        edges = np.array([(u, v) for u, v, _ in self.edges], dtype=np.int64).reshape(-1, 2)
+        return BitAdjacencyMatrix.from_edges(self.vertices, edges, directed=False)
 
     def print_adjacency_matrix(self):
         """Вывод матрицы смежности для графа."""
@@ -46,59 +149,40 @@ class WeightedGraph:
 # ---------- Алгоритм Краскала ----------
 def kruskal(graph: WeightedGraph):
     """Алгоритм Краскала для построения минимального остовного дерева."""
-    # Сортируем рёбра по весу
-    edges = sorted(graph.edges, key=lambda edge: edge[2])
-    parent = list(range(graph.vertices))
-    rank = [0] * graph.vertices
-    mst = []
-
-    def find(u):
-        """Функция для поиска сжатия пути."""
-        if parent[u] != u:
-            parent[u] = find(parent[u])
-        return parent[u]
-
-    def union(u, v):
-        """Объединяет два дерева."""
-        root_u = find(u)
-        root_v = find(v)
-
-        if root_u != root_v:
-            if rank[root_u] > rank[root_v]:
-                parent[root_v] = root_u
-            elif rank[root_u] < rank[root_v]:
-                parent[root_u] = root_v
-            else:
-                parent[root_v] = root_u
-                rank[root_u] += 1
-
-    # Проходим по всем рёбрам
-    for u, v, weight in edges:
-        if find(u) != find(v):
-            mst.append((u, v, weight))
-            union(u, v)
-
-    return mst
+    if not graph.edges:
+        return []
+    # Сортируем рёбра по весу (устойчиво, как sorted); веса не приводятся к целым
+    order = np.argsort(np.asarray([w for _, _, w in graph.edges]), kind="stable")
+    ends = np.array([(u, v) for u, v, _ in graph.edges], dtype=np.int64)[order]
+
+    # Проходим по рёбрам, пока не набрано V - 1 ребро (осталась одна компонента)
+    components = DisjointSet(graph.vertices)
+    merged = components.union_many(ends[:, 0], ends[:, 1], stop_components=1)
+    return [graph.edges[i] for i in order[merged].tolist()]
 
 
 # ---------- Тестирование и замеры ----------
 def test_kruskal():
-    vertex_sets = [10, 20, 50, 100]  # Количество вершин для графов
-    min_edges = [3, 4, 10, 20]
+    vertex_sets = [10, 20, 50, 100, 1000, 10 ** 4, 10 ** 5]  # Количество вершин для графов
+    min_edges = [3, 4, 10, 20, 3, 3, 3]
+    # Для больших графов степень ограничена, иначе рёбер было бы порядка V^2 / 4
+    max_edges = [None, None, None, None, 10, 10, 10]
+    print_limit = 100  # Матрица и дерево печатаются только для небольших графов
     iterations = 5  # Количество тестов на один граф
     results = []
 
-    for vertices, min_edges_per_vertex in zip(vertex_sets, min_edges):
+    for vertices, min_edges_per_vertex, max_edges_per_vertex in zip(vertex_sets, min_edges, max_edges):
         times = []
 
         for _ in range(iterations):
             # Генерация графа
             graph = WeightedGraph(vertices)
-            graph.generate_random_graph(min_edges_per_vertex)
+            graph.generate_random_graph(min_edges_per_vertex, max_edges_per_vertex=max_edges_per_vertex)
 
             # Печать графа (опционально включить для отладки)
-            print(f"\nГраф с {vertices} вершинами:")
-            graph.print_adjacency_matrix()
+            print(f"\nГраф с {vertices} вершинами, рёбер: {len(graph.edges)}")
+            if vertices <= print_limit:
+                graph.print_adjacency_matrix()
 
             # Замер времени на выполнение алгоритма Краскала
             start_time = time.time()
@@ -107,7 +191,8 @@ def test_kruskal():
             times.append(elapsed_time)
 
             # Печать результата остовного дерева
-            print(f"\nОстовное дерево (MST): {mst}")
+            if vertices <= print_limit:
+                print(f"\nОстовное дерево (MST): {mst}")
             print(f"Время выполнения: {elapsed_time:.5f} сек")
 
         # Записываем среднее время
@@ -117,6 +202,8 @@ def test_kruskal():
     # Построение графика
     plt.figure(figsize=(10, 6))
     plt.plot([r[0] for r in results], [r[1] for r in results], label="Алгоритм Краскала", marker="o")
+    plt.xscale("log")
+    plt.yscale("log")
     plt.xlabel("Количество вершин (N)")
     plt.ylabel("Время выполнения (секунды)")
     plt.title("Время выполнения алгоритма Краскала")
@@ -126,4 +213,5 @@ def test_kruskal():
 
 
 # ---------- Запуск тестов ----------
-test_kruskal()
+if __name__ == "__main__":
+    test_kruskal()
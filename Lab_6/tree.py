@@ -1,8 +1,12 @@
+import os
 import time
 import random
 import matplotlib.pyplot as plt
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_runner import run_cells
+
 # Устанавливаем лимит рекурсии, иначе получим супер вкуснятину в виде переполнения стека рекурсиями
 # (я не мог это решить пару часов, поэтому ЭТО НАСТОЛЬКО ВАЖНО). В данном случае предельная глубина рекурсий 15000
 sys.setrecursionlimit(15000)
@@ -208,75 +212,81 @@ class AVLTree:
         return current
 
 
-# Функция для тестирования
-def run_tests():
-    times_insert_bst = []
-    times_insert_avl = []
-    times_search_bst = []
-    times_search_avl = []
-    times_search_array = []
-    times_delete_bst = []
-    times_delete_avl = []
-
-    for i in range(10):
-        size = 2 ** (10 + i)
-
-        random_array = [random.randint(0, size) for _ in range(size)]
-        # sorted_array = list(range(size)) # No longer need sorted array
-
-        # for array, name in [(random_array, "Random"), (sorted_array, "Sorted")]: # change here
-        for array, name in [(random_array, "Random")]:
-            bst = BST()
-            avl = AVLTree()
-
-            # Вставка элементов в деревья
-            start_time = time.time()
-            for num in array:
-                bst.insert(num)
-            times_insert_bst.append(time.time() - start_time)
-
-            start_time = time.time()
-            for num in array:
-                avl.insert(num)
-            times_insert_avl.append(time.time() - start_time)
-
-            # Поиск 1000 случайных элементов
-            search_times_bst = []
-            search_times_avl = []
-            for _ in range(1000):
-                key = random.choice(array)
-                start_time = time.time()
-                bst.search(key)
-                search_times_bst.append(time.time() - start_time)
-
-                start_time = time.time()
-                avl.search(key)
-                search_times_avl.append(time.time() - start_time)
-            times_search_bst.append(sum(search_times_bst) / 1000)
-            times_search_avl.append(sum(search_times_avl) / 1000)
-
-            # Поиск в обычном массиве
-            search_times_array = []
-            for _ in range(1000):
-                key = random.choice(array)
-                start_time = time.time()
-                key in array
-                search_times_array.append(time.time() - start_time)
-            times_search_array.append(sum(search_times_array) / 1000)
-
-            # Удаление элементов из деревьев
-            start_time = time.time()
-            for num in array:
-                bst.delete(num)
-            times_delete_bst.append(time.time() - start_time)
-
-            start_time = time.time()
-            for num in array:
-                avl.delete(num)
-            times_delete_avl.append(time.time() - start_time)
+# Один замер для bench_runner: ячейка (размер,), деревья строятся заново в каждой ячейке
+def tree_cell(cell, seed):
+    size, = cell
+    array = [random.randint(0, size) for _ in range(size)]
+    bst = BST()
+    avl = AVLTree()
+
+    # Вставка элементов в деревья
+    start_time = time.time()
+    for num in array:
+        bst.insert(num)
+    insert_bst = time.time() - start_time
+
+    start_time = time.time()
+    for num in array:
+        avl.insert(num)
+    insert_avl = time.time() - start_time
+
+    # Поиск 1000 случайных элементов
+    search_times_bst = []
+    search_times_avl = []
+    for _ in range(1000):
+        key = random.choice(array)
+        start_time = time.time()
+        bst.search(key)
+        search_times_bst.append(time.time() - start_time)
+
+        start_time = time.time()
+        avl.search(key)
+        search_times_avl.append(time.time() - start_time)
+
+    # Поиск в обычном массиве
+    search_times_array = []
+    for _ in range(1000):
+        key = random.choice(array)
+        start_time = time.time()
+        key in array
+        search_times_array.append(time.time() - start_time)
+
+    # Удаление элементов из деревьев
+    start_time = time.time()
+    for num in array:
+        bst.delete(num)
+    delete_bst = time.time() - start_time
+
+    start_time = time.time()
+    for num in array:
+        avl.delete(num)
+    delete_avl = time.time() - start_time
+
+    return {
+        "insert_bst": insert_bst,
+        "insert_avl": insert_avl,
+        "search_bst": sum(search_times_bst) / 1000,
+        "search_avl": sum(search_times_avl) / 1000,
+        "search_array": sum(search_times_array) / 1000,
+        "delete_bst": delete_bst,
+        "delete_avl": delete_avl,
+    }
+
+
+# Функция для тестирования: размеры независимы и замеряются параллельно (bench_runner)
+def run_tests(workers=None):
+    sizes = [2 ** (10 + i) for i in range(10)]
+    results = run_cells(tree_cell, [(size,) for size in sizes], workers=workers)
+
+    times_insert_bst = [result["insert_bst"] for result in results]
+    times_insert_avl = [result["insert_avl"] for result in results]
+    times_search_bst = [result["search_bst"] for result in results]
+    times_search_avl = [result["search_avl"] for result in results]
+    times_search_array = [result["search_array"] for result in results]
+    times_delete_bst = [result["delete_bst"] for result in results]
+    times_delete_avl = [result["delete_avl"] for result in results]
 
     # Построение графиков
-    sizes = [2 ** (10 + i) for i in range(10)]
 
     plt.figure(figsize=(12, 8))
     plt.subplot(3, 1, 1)
@@ -308,4 +318,6 @@ def run_tests():
     plt.show()
 
 
-run_tests()
\ No newline at end of file
+if __name__ == "__main__":
+    # Число процессов: python tree.py [workers]
+    run_tests(int(sys.argv[1]) if len(sys.argv) > 1 else None)
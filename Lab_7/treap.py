@@ -1,8 +1,13 @@
+import os
 import random
+import sys
 import time
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_runner import run_cells
+
 class TreapNode:
     def __init__(self, key):
         self.key = key
@@ -206,65 +211,74 @@ class AVLTree:
 
 
 
-def run_tests():
+# Один замер для bench_runner: ячейка (N,), деревья строятся заново в каждой ячейке
+def treap_cell(cell, seed):
+    N, = cell
+    treap = Treap()
+    avl = AVLTree()
+
+    # Генерация случайных значений
+    values = [random.randint(1, 1000000) for _ in range(N)]
+
+    # Заполнение деревьев
+    for value in values:
+        treap.insert(value)
+        avl.insert(value)
+
+    # Измерение максимальной глубины
+    result = {
+        "treap_max_depth": treap.get_max_depth(),
+        "avl_max_depth": avl.get_max_depth(),
+    }
+
+    # Вставка
+    start_time = time.time()
+    for value in values:
+        treap.insert(value)
+    result["treap_insert"] = (time.time() - start_time) / N
+
+    start_time = time.time()
+    for value in values:
+        avl.insert(value)
+    result["avl_insert"] = (time.time() - start_time) / N
+
+    # Удаление
+    start_time = time.time()
+    for value in values:
+        treap.delete(value)
+    result["treap_delete"] = (time.time() - start_time) / N
+
+    start_time = time.time()
+    for value in values:
+        avl.delete(value)
+    result["avl_delete"] = (time.time() - start_time) / N
+
+    # Поиск
+    start_time = time.time()
+    for value in values:
+        treap.search(value)
+    result["treap_search"] = (time.time() - start_time) / N
+
+    start_time = time.time()
+    for value in values:
+        avl.search(value)
+    result["avl_search"] = (time.time() - start_time) / N
+    return result
+
+
+# Размеры независимы и замеряются параллельно (bench_runner)
+def run_tests(workers=None):
     N_values = [2**i for i in range(10, 19)]
-    treap_insert_times = []
-    treap_delete_times = []
-    treap_search_times = []
-    avl_insert_times = []
-    avl_delete_times = []
-    avl_search_times = []
-    treap_max_depths = []
-    avl_max_depths = []
-
-    for N in N_values:
-        treap = Treap()
-        avl = AVLTree()
-
-        # Генерация случайных значений
-        values = [random.randint(1, 1000000) for _ in range(N)]
-
-        # Заполнение деревьев
-        for value in values:
-            treap.insert(value)
-            avl.insert(value)
-
-        # Измерение максимальной глубины
-        treap_max_depths.append(treap.get_max_depth())
-        avl_max_depths.append(avl.get_max_depth())
-
-        # Вставка
-        start_time = time.time()
-        for value in values:
-            treap.insert(value)
-        treap_insert_times.append((time.time() - start_time) / N)
-
-        start_time = time.time()
-        for value in values:
-            avl.insert(value)
-        avl_insert_times.append((time.time() - start_time) / N)
-
-        # Удаление
-        start_time = time.time()
-        for value in values:
-            treap.delete(value)
-        treap_delete_times.append((time.time() - start_time) / N)
-
-        start_time = time.time()
-        for value in values:
-            avl.delete(value)
-        avl_delete_times.append((time.time() - start_time) / N)
-
-        # Поиск
-        start_time = time.time()
-        for value in values:
-            treap.search(value)
-        treap_search_times.append((time.time() - start_time) / N)
-
-        start_time = time.time()
-        for value in values:
-            avl.search(value)
-        avl_search_times.append((time.time() - start_time) / N)
+    results = run_cells(treap_cell, [(N,) for N in N_values], workers=workers)
+
+    treap_insert_times = [result["treap_insert"] for result in results]
+    treap_delete_times = [result["treap_delete"] for result in results]
+    treap_search_times = [result["treap_search"] for result in results]
+    avl_insert_times = [result["avl_insert"] for result in results]
+    avl_delete_times = [result["avl_delete"] for result in results]
+    avl_search_times = [result["avl_search"] for result in results]
+    treap_max_depths = [result["treap_max_depth"] for result in results]
+    avl_max_depths = [result["avl_max_depth"] for result in results]
 
     # Графики
     plt.figure(figsize=(10, 6))
@@ -303,4 +317,7 @@ def run_tests():
     plt.legend()
     plt.show()
 
-run_tests()
+
+if __name__ == "__main__":
+    # Число процессов: python treap.py [workers]
+    run_tests(int(sys.argv[1]) if len(sys.argv) > 1 else None)
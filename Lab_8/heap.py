@@ -1,8 +1,13 @@
+import os
+import sys
 import time
 import random
 import heapq
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_runner import run_cells
+
 
 # Бинарная куча (мин-куча)
 class MinHeap:
@@ -119,79 +124,79 @@ class BinomialHeap:
 
 
 
-# Тестирование
-def run_tests():
+# Один замер для bench_runner: ячейка (N,), обе кучи строятся заново в каждой ячейке
+def heap_cell(cell, seed):
+    size, = cell
+
+    # Генерация случайных данных
+    data = [random.randint(1, 1000000) for _ in range(size)]
+
+    # Тест для MinHeap
+    min_heap = MinHeap()
+    for val in data:
+        min_heap.insert(val)
+
+    # Замер времени для 1000 операций поиска минимума
+    start_time = time.time()
+    for _ in range(1000):
+        min_heap.get_min()
+    search_time = (time.time() - start_time) / 1000
+
+    # Замер времени для 1000 операций удаления минимума
+    start_time = time.time()
+    for _ in range(1000):
+        min_heap.remove_min()
+    remove_time = (time.time() - start_time) / 1000
+
+    # Замер времени для 1000 операций добавления нового элемента
+    start_time = time.time()
+    for _ in range(1000):
+        min_heap.insert(random.randint(1, 1000000))
+    insert_time = (time.time() - start_time) / 1000
+
+    # Тест для BinomialHeap
+    binomial_heap = BinomialHeap()
+    for val in data:
+        binomial_heap.insert(val)
+
+    # Замер времени для 1000 операций поиска минимума
+    start_time = time.time()
+    for _ in range(1000):
+        binomial_heap.get_min()
+    binomial_search_time = (time.time() - start_time) / 1000
+
+    # Замер времени для 1000 операций удаления минимума
+    start_time = time.time()
+    for _ in range(1000):
+        binomial_heap.remove_min()
+    binomial_remove_time = (time.time() - start_time) / 1000
+
+    # Замер времени для 1000 операций добавления нового элемента
+    start_time = time.time()
+    for _ in range(1000):
+        binomial_heap.insert(random.randint(1, 1000000))
+    binomial_insert_time = (time.time() - start_time) / 1000
+
+    return {
+        'size': size,
+        'min_heap_insert': insert_time,
+        'min_heap_remove': remove_time,
+        'min_heap_search': search_time,
+        'binomial_insert': binomial_insert_time,
+        'binomial_remove': binomial_remove_time,
+        'binomial_search': binomial_search_time
+    }
+
+
+# Тестирование: размеры независимы и замеряются параллельно (bench_runner)
+def run_tests(workers=None):
     sizes = [10**i for i in range(3, 8)]  # N = 10^i для i от 3 до 7
-    results = []
-
-    for size in sizes:
-        print(f"Running tests for N={size}")
-
-        # Генерация случайных данных
-        data = [random.randint(1, 1000000) for _ in range(size)]
-
-        # Тест для MinHeap
-        min_heap = MinHeap()
-        for val in data:
-            min_heap.insert(val)
-
-        # Замер времени для 1000 операций поиска минимума
-        start_time = time.time()
-        for _ in range(1000):
-            min_heap.get_min()
-        search_time = (time.time() - start_time) / 1000
-
-        # Замер времени для 1000 операций удаления минимума
-        start_time = time.time()
-        for _ in range(1000):
-            min_heap.remove_min()
-        remove_time = (time.time() - start_time) / 1000
-
-        # Замер времени для 1000 операций добавления нового элемента
-        start_time = time.time()
-        for _ in range(1000):
-            min_heap.insert(random.randint(1, 1000000))
-        insert_time = (time.time() - start_time) / 1000
-
-        # Сохраняем результаты для MinHeap
-        results.append({
-            'size': size,
-            'min_heap_insert': insert_time,
-            'min_heap_remove': remove_time,
-            'min_heap_search': search_time
-        })
-        print(f"MinHeap - Search Time: {search_time:.6f}s, Remove Time: {remove_time:.6f}s, Insert Time: {insert_time:.6f}s")
-
-        # Тест для BinomialHeap
-        binomial_heap = BinomialHeap()
-        for val in data:
-            binomial_heap.insert(val)
-
-        # Замер времени для 1000 операций поиска минимума
-        start_time = time.time()
-        for _ in range(1000):
-            binomial_heap.get_min()
-        binomial_search_time = (time.time() - start_time) / 1000
-
-        # Замер времени для 1000 операций удаления минимума
-        start_time = time.time()
-        for _ in range(1000):
-            binomial_heap.remove_min()
-        binomial_remove_time = (time.time() - start_time) / 1000
-
-        # Замер времени для 1000 операций добавления нового элемента
-        start_time = time.time()
-        for _ in range(1000):
-            binomial_heap.insert(random.randint(1, 1000000))
-        binomial_insert_time = (time.time() - start_time) / 1000
-
-        # Сохраняем результаты для BinomialHeap
-        results[-1].update({
-            'binomial_insert': binomial_insert_time,
-            'binomial_remove': binomial_remove_time,
-            'binomial_search': binomial_search_time
-        })
-        print(f"BinomialHeap - Search Time: {binomial_search_time:.6f}s, Remove Time: {binomial_remove_time:.6f}s, Insert Time: {binomial_insert_time:.6f}s")
+    results = run_cells(heap_cell, [(size,) for size in sizes], workers=workers)
+
+    for result in results:
+        print(f"N={result['size']}")
+        print(f"MinHeap - Search Time: {result['min_heap_search']:.6f}s, Remove Time: {result['min_heap_remove']:.6f}s, Insert Time: {result['min_heap_insert']:.6f}s")
+        print(f"BinomialHeap - Search Time: {result['binomial_search']:.6f}s, Remove Time: {result['binomial_remove']:.6f}s, Insert Time: {result['binomial_insert']:.6f}s")
 
     plot_graphs(results)
 
@@ -235,4 +240,5 @@ def plot_graphs(results):
 
 
 if __name__ == "__main__":
-    run_tests()
+    # Число процессов: python heap.py [workers]
+    run_tests(int(sys.argv[1]) if len(sys.argv) > 1 else None)
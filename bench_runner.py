@@ -0,0 +1,61 @@
+import hashlib
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ---------- Общий параллельный запуск замеров ----------
+# Замер описывается ячейкой (алгоритм, размер, повтор). Функция замера
+# вызывается как function(cell, seed) и возвращает словарь с результатами.
+
+def cell_seed(base_seed, cell):
+    """Детерминированное зерно ячейки: не зависит от процесса и порядка выполнения"""
+    digest = hashlib.sha256(repr((base_seed, tuple(cell))).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _run_cell(function, cell, base_seed):
+    seed = cell_seed(base_seed, cell)
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed % 2 ** 32)
+    except ImportError:
+        pass
+    return function(cell, seed)
+
+
+def _pin_worker(cpus, counter):
+    """Инициализатор процесса: закрепляет каждого работника за своим ядром"""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+
+def run_cells(function, cells, workers=None, base_seed=0, pin_cpus=True):
+    """
+    Выполняет function(cell, seed) для каждой ячейки и возвращает список словарей
+    {"cell": ячейка, **результат} в порядке cells.
+    Перед каждой ячейкой random (и numpy.random) засеиваются cell_seed(base_seed, cell),
+    поэтому при одинаковом base_seed результаты совпадают с последовательным запуском
+    (workers=1) независимо от числа процессов.
+    """
+    cells = list(cells)
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        results = [_run_cell(function, cell, base_seed) for cell in cells]
+    else:
+        initializer, initargs = None, ()
+        if pin_cpus and hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+            initializer, initargs = _pin_worker, (cpus, multiprocessing.Value("i", 0))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+            futures = [executor.submit(_run_cell, function, cell, base_seed) for cell in cells]
+            results = [future.result() for future in futures]
+
+    return [{"cell": cell, **result} for cell, result in zip(cells, results)]
@@ -0,0 +1,100 @@
+import re
+
+import numpy as np
+
+
+# ---------- Потоковый разбор текстовых журналов замеров ----------
+
+# Lab_1: "1000 Time taken: 0.001000 seconds, Entries: 999, Exchanges: 248145"
+INSERTION_LOG = re.compile(
+    r"(\d+)\s+Time taken: ([\d.]+)\s+seconds,\s+Entries:\s+(\d+),\s+Exchanges:\s+(\d+)"
+)
+INSERTION_FIELDS = ["time", "entries", "exchanges"]
+
+# Lab_2: "Размерность: 1000 Время: 0.001377 Количество вызовов рекурсии: 1319 ..."
+QUICKSORT_LOG = re.compile(
+    r"Размерность: (\d+) Время: ([\d.]+) Количество вызовов рекурсии: (\d+) "
+    r"Глубина рекурсии: (\d+) Количество обменов: (\d+)"
+)
+QUICKSORT_FIELDS = ["time", "recursion_calls", "depth", "swaps"]
+
+CHUNK_SIZE = 1 << 24
+
+
+class RunningStats:
+    """Минимум, максимум, среднее и дисперсия без хранения значений (алгоритм Уэлфорда)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def update(self, values):
+        """Добавляет пачку значений: статистики пачки сливаются с накопленными (формула Чана)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        count = values.size
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+def iter_chunks(file_name, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """Читает файл кусками примерно по chunk_size символов, не разрывая строки"""
+    tail = ""
+    with open(file_name, "r", encoding=encoding) as file:
+        while True:
+            block = file.read(chunk_size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind("\n") + 1
+            if cut == 0:
+                tail = block
+                continue
+            tail = block[cut:]
+            yield block[:cut]
+    if tail:
+        yield tail
+
+
+def iter_rows(file_name, pattern, chunk_size=CHUNK_SIZE):
+    """Отдаёт строки журнала пачками: numpy-массив (строк x групп regex) на каждый кусок"""
+    for chunk in iter_chunks(file_name, chunk_size):
+        matches = pattern.findall(chunk)
+        if matches:
+            yield np.array(matches, dtype=np.float64)
+
+
+def stream_stats(file_name, pattern, fields, chunk_size=CHUNK_SIZE):
+    """
+    Агрегирует журнал по размерности (первая группа regex) без хранения строк.
+    Возвращает {размерность: {поле: RunningStats}}.
+    """
+    stats = {}
+    for rows in iter_rows(file_name, pattern, chunk_size):
+        sizes = rows[:, 0].astype(np.int64)
+        for size in np.unique(sizes):
+            group = rows[sizes == size]
+            size_stats = stats.setdefault(int(size), {field: RunningStats() for field in fields})
+            for column, field in enumerate(fields, start=1):
+                size_stats[field].update(group[:, column])
+    return stats